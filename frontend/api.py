@@ -15,7 +15,7 @@ import json
 from scim_server.database import get_db
 from scim_server.models import User, Group, Entitlement, UserGroup, UserEntitlement, AppProfile
 from scim_server.auth import get_api_key
-from scim_server.server_config import get_server_config_manager
+from scim_server.server_config import get_server_config_manager, strip_derived_keys
 
 # Create router for frontend API endpoints
 router = APIRouter(prefix="/api", tags=["Frontend"])
@@ -87,7 +87,7 @@ def get_server_summary(server_id: str, db) -> Dict[str, Any]:
                 "user_group_relationships": user_group_relationships,
                 "user_entitlement_relationships": user_entitlement_relationships
             },
-            "config": server_config,
+            "config": strip_derived_keys(server_config),
             "app_profile": app_profile,
             "last_updated": datetime.utcnow().isoformat() + "Z"
         }
@@ -125,6 +125,9 @@ async def list_servers(api_key: str = Depends(get_api_key)) -> Dict[str, Any]:
                 "generated_at": datetime.utcnow().isoformat() + "Z"
             }
         
+        # Load all server configs with one query instead of one per summary
+        get_server_config_manager(db).preload_server_configs(server_ids)
+        
         # Get summary for each server
         servers = []
         for server_id in server_ids:
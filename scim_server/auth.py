@@ -1,13 +1,20 @@
+import re
+
 from fastapi import HTTPException, Depends, Header
 from loguru import logger
 from .config import settings
 from .server_context import get_server_id_from_path
 
-def get_api_key(authorization: str = Header(None)) -> str:
+_SERVER_ID_PATTERN = re.compile(r'^[a-zA-Z0-9\-_]+$')
+
+async def get_api_key(authorization: str = Header(None)) -> str:
     """
     Validate API key from Authorization header.
     Returns the API key name if valid, raises 401 if invalid/missing.
     
+    Async (but non-blocking) so FastAPI resolves it on the event loop instead of
+    dispatching it to the threadpool on every request.
+    
     Simplified for development server - only accepts two API keys from config:
     - settings.default_api_key for normal server operations
     - settings.test_api_key for test operations
@@ -37,10 +44,10 @@ def get_api_key(authorization: str = Header(None)) -> str:
     
     # Simple validation against config keys
     if token == settings.default_api_key:
-        logger.info("Valid default API key used")
+        logger.debug("Valid default API key used")
         return "default"
     elif token == settings.test_api_key:
-        logger.info("Valid test API key used")
+        logger.debug("Valid test API key used")
         return "test"
     else:
         logger.warning(f"Invalid API key attempted")
@@ -69,18 +76,17 @@ def validate_server_id(server_id: str) -> str:
         )
     
     # Basic validation - server_id should be a valid UUID or alphanumeric
-    import re
-    if not re.match(r'^[a-zA-Z0-9\-_]+$', server_id):
+    if not _SERVER_ID_PATTERN.match(server_id):
         logger.warning(f"Invalid server_id format: {server_id}")
         raise HTTPException(
             status_code=400,
             detail="Server ID must contain only alphanumeric characters, hyphens, and underscores"
         )
     
-    logger.info(f"Valid server_id: {server_id}")
+    logger.debug("Valid server_id: {}", server_id)
     return server_id
 
-def get_validated_server_id(server_id: str = Depends(get_server_id_from_path)) -> str:
+async def get_validated_server_id(server_id: str = Depends(get_server_id_from_path)) -> str:
     """
     Dependency function that validates server_id from path.
     This ensures all endpoints that require server_id get proper validation.
@@ -17,6 +17,10 @@ class Settings:
     rate_limit_window: int = 30  # seconds
     rate_limit_create: int = 500  # requests per window for create operations
     rate_limit_read: int = 500   # requests per window for read operations
+    rate_limit_strategy: str = "fixed-window"  # O(1) counter per key; moving-window is O(limit)
+    rate_limit_storage_uri: str = "memory://"
+    discovery_cache_max_age: int = 60  # seconds clients may reuse discovery responses
+    discovery_rate_limit_max_clients: int = 10000  # discovery token buckets kept (LRU)
     
     # Server settings
     host: str = "0.0.0.0"  # Server binding address
@@ -277,4 +281,9 @@ class Settings:
     }
 
 # Global settings instance
-settings = Settings() 
\ No newline at end of file
+settings = Settings()
+
+# Rate limit strings shared by the endpoint decorators (slowapi parses each once, when
+# the decorated endpoint is defined)
+READ_RATE_LIMIT = f"{settings.rate_limit_read}/{settings.rate_limit_window}minute"
+CREATE_RATE_LIMIT = f"{settings.rate_limit_create}/{settings.rate_limit_window}minute"
@@ -4,10 +4,13 @@ This module provides generic CRUD functions that can be used across all entity t
 """
 
 from sqlalchemy.orm import Session, Query
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 from typing import List, Optional, TypeVar, Generic, Type, Any
 from loguru import logger
 
+from .config import settings
+from .utils import parse_scim_filter
+
 # Generic type for SQLAlchemy models
 T = TypeVar('T')
 
@@ -51,15 +54,10 @@ class BaseCRUD(Generic[T]):
                  filter_query: Optional[str] = None, sort_by: Optional[str] = None, 
                  sort_order: str = "ascending") -> List[T]:
         """Get list of entities with optional filtering and sorting within a specific server."""
-        from .config import settings
         if limit is None:
             limit = settings.default_page_size
         
-        query = db.query(self.model).filter(getattr(self.model, 'server_id') == server_id)
-        
-        # Apply custom filtering if provided
-        if filter_query:
-            query = self._apply_filter(query, filter_query)
+        query = self._server_query(db.query(self.model), server_id, filter_query)
         
         # Apply sorting if provided
         if sort_by:
@@ -113,13 +111,23 @@ class BaseCRUD(Generic[T]):
         logger.info(f"{self.model.__name__} deleted successfully: {entity_id}")
         return True
     
-    def count(self, db: Session, server_id: str) -> int:
-        """Count entities in a specific server."""
-        return db.query(self.model).filter(getattr(self.model, 'server_id') == server_id).count()
+    def count(self, db: Session, server_id: str, filter_query: Optional[str] = None) -> int:
+        """Count entities in a specific server, optionally matching a SCIM filter."""
+        query = db.query(func.count(getattr(self.model, 'id')))
+        return self._server_query(query, server_id, filter_query).scalar()
+    
+    def _server_query(self, query: Query, server_id: str, filter_query: Optional[str]) -> Query:
+        """Restrict query to a server and apply the SCIM filter, if any (shared by get_list and count)."""
+        query = query.filter(getattr(self.model, 'server_id') == server_id)
+        
+        # Apply custom filtering if provided
+        if filter_query:
+            query = self._apply_filter(query, filter_query)
+        
+        return query
     
     def _apply_filter(self, query: Query, filter_query: str) -> Query:
         """Apply SCIM filter to query. Override in subclasses for entity-specific filtering."""
-        from .utils import parse_scim_filter
         filter_info = parse_scim_filter(filter_query)
         
         if filter_info:
@@ -157,8 +165,6 @@ class BaseCRUD(Generic[T]):
         Validate sort parameters and return validated values.
         Returns (validated_sort_by, validated_sort_order) or raises ValueError.
         """
-        from .config import settings
-        
         # Get entity type from model name
         entity_type = self.model.__name__
         allowed_fields = settings.sortable_fields.get(entity_type, [])
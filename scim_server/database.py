@@ -27,6 +27,28 @@ def get_db():
     finally:
         db.close()
 
+async def get_db_factory():
+    """
+    Dependency providing a callable that opens a database session on first use.
+    
+    Being async, it is resolved on the event loop rather than the threadpool that the
+    sync get_db generator needs for setup and teardown, and the session is only
+    created (and closed) when the endpoint actually asks for it.
+    """
+    db = None
+    
+    def factory():
+        nonlocal db
+        if db is None:
+            db = SessionLocal()
+        return db
+    
+    try:
+        yield factory
+    finally:
+        if db is not None:
+            db.close()
+
 def init_db():
     """Initialize the database by creating all tables."""
     logger.info("Initializing database...")
@@ -3,6 +3,8 @@ Base endpoint classes for all SCIM entities.
 This module eliminates massive code duplication by providing generic endpoint patterns.
 """
 
+from types import MappingProxyType
+
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any, TypeVar, Generic, Type
@@ -13,7 +15,7 @@ from slowapi.util import get_remote_address
 from .database import get_db
 from .auth import get_api_key, get_validated_server_id
 # Removed ApiKey import - no longer needed
-from .config import settings
+from .config import settings, READ_RATE_LIMIT, CREATE_RATE_LIMIT
 from .server_context import get_server_id_from_path
 from .utils import validate_scim_id, create_scim_list_response
 from .schema_validator import create_schema_validator
@@ -25,6 +27,14 @@ UpdateSchema = TypeVar('UpdateSchema')
 ResponseSchema = TypeVar('ResponseSchema')
 ListResponseSchema = TypeVar('ListResponseSchema')
 
+# CRUD update method name per entity type
+_UPDATE_METHODS = MappingProxyType({
+    "User": "update_user",
+    "Group": "update_group",
+    "Entitlement": "update_entitlement",
+})
+
+
 class BaseEntityEndpoint(Generic[T, CreateSchema, UpdateSchema, ResponseSchema, ListResponseSchema]):
     """
     Base class for all entity endpoints that eliminates massive code duplication.
@@ -58,9 +68,16 @@ class BaseEntityEndpoint(Generic[T, CreateSchema, UpdateSchema, ResponseSchema,
         self.schema_uri = schema_uri
         self.supports_multi_server = supports_multi_server
         self.server_id_dependency = server_id_dependency or get_validated_server_id
+        # Bound CRUD update method for this entity type, resolved once instead of per request
+        update_method = _UPDATE_METHODS.get(entity_type)
+        self._update_entity = getattr(crud_operations, update_method, None) if update_method else None
         
         # Initialize rate limiter
-        self.limiter = Limiter(key_func=get_remote_address)
+        self.limiter = Limiter(
+            key_func=get_remote_address,
+            strategy=settings.rate_limit_strategy,
+            storage_uri=settings.rate_limit_storage_uri,
+        )
         
         # Register all endpoints
         self._register_endpoints()
@@ -69,9 +86,8 @@ class BaseEntityEndpoint(Generic[T, CreateSchema, UpdateSchema, ResponseSchema,
         """Register all CRUD endpoints with the router."""
         
         # Create endpoint
-        @self.router.post("/", response_model=self.response_schema, status_code=201)
-        @self.router.post("", response_model=self.response_schema, status_code=201)  # Without trailing slash
-        @self.limiter.limit(f"{settings.rate_limit_create}/{settings.rate_limit_window}minute")
+        @self.router.post("", response_model=self.response_schema, status_code=201)
+        @self.limiter.limit(CREATE_RATE_LIMIT)
         async def create_entity_endpoint(
             request: Request,
             entity_data: dict,
@@ -81,10 +97,9 @@ class BaseEntityEndpoint(Generic[T, CreateSchema, UpdateSchema, ResponseSchema,
         ):
             return await self._create_entity_raw(entity_data, server_id, db)
         
-        # List endpoint - support both with and without trailing slash
-        @self.router.get("/", response_model=self.list_response_schema)
-        @self.router.get("", response_model=self.list_response_schema)  # Without trailing slash
-        @self.limiter.limit(f"{settings.rate_limit_read}/{settings.rate_limit_window}minute")
+        # List endpoint (a trailing slash is stripped before routing)
+        @self.router.get("", response_model=self.list_response_schema)
+        @self.limiter.limit(READ_RATE_LIMIT)
         async def get_entities_endpoint(
             request: Request,
             start_index: int = Query(1, ge=1, alias="startIndex", description="1-based index of the first result"),
@@ -267,14 +282,8 @@ class BaseEntityEndpoint(Generic[T, CreateSchema, UpdateSchema, ResponseSchema,
         # Get entities from database with filter and sort
         entities = self.crud.get_list(db, skip=skip, limit=count, filter_query=filter_query, sort_by=sort_by, sort_order=sort_order, server_id=server_id)
         
-        # Get total count for pagination
-        if filter_query:
-            # Get total count of filtered results
-            filtered_entities = self.crud.get_list(db, skip=0, limit=settings.max_count_limit, filter_query=filter_query, server_id=server_id)
-            total_count = len(filtered_entities)
-        else:
-            # Get total count of all entities in this server
-            total_count = self.crud.count(db, server_id)
+        # Get total count for pagination with a single COUNT query (filtered if requested)
+        total_count = self.crud.count(db, server_id, filter_query)
         
         # Convert to SCIM response format
         resources = [self.converter.to_scim_response(entity) for entity in entities]
@@ -348,22 +357,17 @@ class BaseEntityEndpoint(Generic[T, CreateSchema, UpdateSchema, ResponseSchema,
             logger.info(f"Validating UPDATE for {self.entity_type}: {entity_data}")
             logger.info(f"Existing data: {existing_data}")
             
-            # Validate against schema
-            validated_data = validator.validate_update_request(self.entity_type, entity_data, existing_data)
+            # Validate against schema; only the request's fields are passed on, since the
+            # CRUD update methods leave fields that are not given unchanged
+            validated_data = validator.validate_update_request_diff(self.entity_type, entity_data)
             
             # Debug logging
             logger.info(f"Validation passed, validated data: {validated_data}")
             
             # Update entity using the appropriate method with validated data
-            if self.entity_type == "User":
-                updated_entity = self.crud.update_user(db, entity_id, validated_data, server_id)
-            elif self.entity_type == "Group":
-                updated_entity = self.crud.update_group(db, entity_id, validated_data, server_id)
-            elif self.entity_type == "Entitlement":
-                updated_entity = self.crud.update_entitlement(db, entity_id, validated_data, server_id)
-            
-            else:
+            if self._update_entity is None:
                 raise ValueError(f"Unsupported entity type: {self.entity_type}")
+            updated_entity = self._update_entity(db, entity_id, validated_data, server_id)
                 
             if not updated_entity:
                 logger.error(f"Failed to update {self.entity_type}: {entity_id}")
@@ -413,24 +417,21 @@ class BaseEntityEndpoint(Generic[T, CreateSchema, UpdateSchema, ResponseSchema,
             # Create schema validator
             validator = create_schema_validator(db, server_id)
             
-            # Validate PATCH operations against schema
+            # Validate PATCH operations against schema. Only the changed fields are passed
+            # on; the CRUD update methods leave fields they are not given untouched, so the
+            # existing resource never needs to be copied and merged.
             if "Operations" in entity_data:
                 # This is a SCIM PATCH request with operations
                 operations = entity_data["Operations"]
-                validated_data = validator.validate_patch_request(self.entity_type, operations, existing_data)
+                validated_data, _ = validator.validate_patch_request_diff(self.entity_type, operations, existing_data)
             else:
                 # This is a regular update (fallback)
-                validated_data = validator.validate_update_request(self.entity_type, entity_data, existing_data)
+                validated_data = validator.validate_update_request_diff(self.entity_type, entity_data)
             
             # Update entity using the appropriate method with validated data
-            if self.entity_type == "User":
-                updated_entity = self.crud.update_user(db, entity_id, validated_data, server_id)
-            elif self.entity_type == "Group":
-                updated_entity = self.crud.update_group(db, entity_id, validated_data, server_id)
-            elif self.entity_type == "Entitlement":
-                updated_entity = self.crud.update_entitlement(db, entity_id, validated_data, server_id)
-            else:
+            if self._update_entity is None:
                 raise ValueError(f"Unsupported entity type: {self.entity_type}")
+            updated_entity = self._update_entity(db, entity_id, validated_data, server_id)
                 
             if not updated_entity:
                 logger.error(f"Failed to patch {self.entity_type}: {entity_id}")
@@ -473,11 +474,8 @@ class BaseEntityEndpoint(Generic[T, CreateSchema, UpdateSchema, ResponseSchema,
                 detail=f"{self.entity_type} not found"
             )
         
-        # Delete entity using the appropriate method
-        if self.entity_type == "User":
-            success = self.crud.delete(db, entity_id, server_id)
-        else:
-            success = self.crud.delete(db, entity_id, server_id)
+        # Delete entity (the same CRUD method for every entity type)
+        success = self.crud.delete(db, entity_id, server_id)
             
         if not success:
             logger.error(f"Failed to delete {self.entity_type}: {entity_id}")
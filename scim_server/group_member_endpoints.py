@@ -12,6 +12,7 @@ from loguru import logger
 
 from .database import get_db
 from .auth import get_api_key, get_validated_server_id
+from .json_routing import ORJSONRoute
 from .crud_entities import group_crud, user_crud
 from .config import settings
 from .utils import validate_scim_id
@@ -22,7 +23,8 @@ def create_group_member_router() -> APIRouter:
     
     router = APIRouter(
         prefix="/scim-identifier/{server_id}/scim/v2/Groups/{group_id}/members",
-        tags=["Group Members"]
+        tags=["Group Members"],
+        route_class=ORJSONRoute
     )
     
     @router.post("/{user_id}", status_code=204)
@@ -81,7 +83,7 @@ def create_group_member_router() -> APIRouter:
         logger.info(f"Removed user {user_id} from group {group_id} in server {server_id}")
         return None
     
-    @router.get("/", response_model=List[Dict[str, Any]])
+    @router.get("", response_model=List[Dict[str, Any]])
     async def get_group_members(
         group_id: str = Path(..., description="SCIM ID of the group"),
         server_id: str = Depends(get_validated_server_id),
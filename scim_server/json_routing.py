@@ -0,0 +1,75 @@
+"""
+orjson-backed request parsing for SCIM routes.
+
+FastAPI parses JSON request bodies with `await request.json()`, which uses the standard
+library decoder. Routers created with `route_class=ORJSONRoute` hand their endpoints a
+request whose body is decoded with orjson instead; responses use ORJSONResponse, which
+is configured as the application's default response class.
+
+orjson only handles integers from -2**63 to 2**64 - 1: larger ones are decoded as floats
+(silently losing precision) and cannot be rendered by ORJSONResponse. Bodies that may
+hold such integers are decoded exactly with the standard library instead, and rejected
+with a 400 if an integer is really out of that range.
+"""
+
+import json
+import re
+from typing import Any, Callable, Coroutine
+
+import orjson
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+
+# Integers outside orjson's range have at least 19 digits; other bodies skip the check
+_LONG_DIGIT_RUN = re.compile(rb"\d{19,}")
+_INT_MIN = -(2 ** 63)
+_INT_MAX = 2 ** 64 - 1
+
+_INTEGER_RANGE_DETAIL = {
+    "error": "SCIM_VALIDATION_ERROR",
+    "message": "Integer value out of range",
+    "type": "integer_out_of_range",
+    "help": f"Integer values must be between {_INT_MIN} and {_INT_MAX}."
+}
+
+
+def _has_out_of_range_int(value: Any) -> bool:
+    """Whether a decoded JSON value holds an integer orjson cannot represent."""
+    if type(value) is int:
+        return not _INT_MIN <= value <= _INT_MAX
+    if type(value) is dict:
+        return any(_has_out_of_range_int(item) for item in value.values())
+    if type(value) is list:
+        return any(_has_out_of_range_int(item) for item in value)
+    return False
+
+
+class ORJSONRequest(Request):
+    """Request whose JSON body is decoded with orjson."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            body = await self.body()
+            if _LONG_DIGIT_RUN.search(body) is None:
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError, so FastAPI still
+                # reports malformed bodies as request validation errors
+                self._json = orjson.loads(body)
+            else:
+                data = json.loads(body)
+                if _has_out_of_range_int(data):
+                    raise HTTPException(status_code=400, detail=_INTEGER_RANGE_DETAIL)
+                self._json = data
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """API route that parses JSON request bodies with orjson."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await original_route_handler(ORJSONRequest(request.scope, request.receive))
+
+        return route_handler
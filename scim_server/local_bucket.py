@@ -0,0 +1,77 @@
+"""
+In-process token bucket rate limiting for discovery endpoints.
+
+Discovery requests (ServiceProviderConfig, ResourceTypes, Schemas) are idempotent and
+frequent, so they are limited per process with plain float math instead of going
+through slowapi's limiter machinery. Buckets refill continuously, allowing the same
+average rate as the read limit (`rate_limit_read` requests per `rate_limit_window`
+minutes per client) with bursts of up to `rate_limit_read` requests.
+"""
+
+import time
+from collections import OrderedDict
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from .config import settings
+
+
+class TokenBucket:
+    """Continuously refilling token bucket; not thread-safe, one bucket set per worker."""
+
+    __slots__ = ("tokens", "last", "rate", "capacity")
+
+    def __init__(self, capacity: float, rate: float):
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self.rate = rate
+        self.capacity = capacity
+
+    def consume(self) -> bool:
+        """Take one token if available; return False when the bucket is empty."""
+        now = time.monotonic()
+        tokens = self.tokens + (now - self.last) * self.rate
+        if tokens > self.capacity:
+            tokens = self.capacity
+        self.last = now
+        if tokens < 1.0:
+            self.tokens = tokens
+            return False
+        self.tokens = tokens - 1.0
+        return True
+
+
+_DISCOVERY_CAPACITY = float(settings.rate_limit_read)
+_DISCOVERY_RATE = settings.rate_limit_read / (settings.rate_limit_window * 60.0)
+# Same text slowapi's handler renders for the equivalent "read" limit
+_DISCOVERY_LIMIT_DETAIL = f"Rate limit exceeded: {settings.rate_limit_read} per {settings.rate_limit_window} minute"
+
+# Buckets keyed by client address, mirroring slowapi's get_remote_address key, in LRU
+# order and capped so new (or spoofed) addresses cannot grow the table without limit
+_discovery_buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+_DISCOVERY_MAX_CLIENTS = settings.discovery_rate_limit_max_clients
+
+
+class DiscoveryRateLimitExceeded(Exception):
+    """Raised when a client has exhausted its discovery token bucket."""
+
+
+async def discovery_rate_limit_exceeded_handler(request: Request, exc: DiscoveryRateLimitExceeded) -> JSONResponse:
+    """Render the 429 with the same body as slowapi's _rate_limit_exceeded_handler."""
+    return JSONResponse({"error": _DISCOVERY_LIMIT_DETAIL}, status_code=429)
+
+
+async def check_discovery_rate_limit(request: Request) -> None:
+    """Dependency enforcing the per-client discovery rate limit; raises 429 when exhausted."""
+    client = request.client
+    key = client.host if client else "127.0.0.1"
+    bucket = _discovery_buckets.get(key)
+    if bucket is None:
+        bucket = _discovery_buckets[key] = TokenBucket(_DISCOVERY_CAPACITY, _DISCOVERY_RATE)
+        while len(_discovery_buckets) > _DISCOVERY_MAX_CLIENTS:
+            _discovery_buckets.popitem(last=False)
+    else:
+        _discovery_buckets.move_to_end(key)
+    if not bucket.consume():
+        raise DiscoveryRateLimitExceeded()
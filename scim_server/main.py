@@ -8,7 +8,7 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi.exceptions import HTTPException as FastAPIHTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from datetime import datetime
 import os
@@ -19,6 +19,8 @@ from .database import init_db, get_db
 from .auth import get_api_key
 # Removed ApiKey import - no longer needed
 from .config import settings
+from .local_bucket import DiscoveryRateLimitExceeded, discovery_rate_limit_exceeded_handler
+from .path_normalization import StripTrailingSlashMiddleware
 # Legacy single-server routers removed - all endpoints now use multi-server path-based routing
 from .routing_config import get_routing_config, get_compatibility_info
 
@@ -51,7 +53,11 @@ if settings.log_to_file:
     )
 
 # Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_remote_address,
+    strategy=settings.rate_limit_strategy,
+    storage_uri=settings.rate_limit_storage_uri,
+)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -68,12 +74,17 @@ app = FastAPI(
     title="SCIM.Cloud Development SCIM Server",
     description="A development-friendly SCIM 2.0 server with Okta compatibility",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Normalize trailing slashes before routing so each endpoint needs a single route
+app.add_middleware(StripTrailingSlashMiddleware)
+
 # Add rate limiting
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_exception_handler(DiscoveryRateLimitExceeded, discovery_rate_limit_exceeded_handler)
 
 # Add request logging middleware
 @app.middleware("http")
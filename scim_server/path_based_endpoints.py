@@ -17,6 +17,7 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from .endpoint_base import BaseEntityEndpoint
+from .json_routing import ORJSONRoute
 from .crud_entities import user_crud, group_crud, entitlement_crud
 from .response_converter import user_converter, group_converter, entitlement_converter
 from .schemas import (
@@ -24,14 +25,18 @@ from .schemas import (
     GroupCreate, GroupUpdate, GroupResponse, GroupListResponse,
     EntitlementCreate, EntitlementUpdate, EntitlementResponse, EntitlementListResponse
 )
-from .config import settings
+from .config import settings, CREATE_RATE_LIMIT
 from .auth import get_validated_server_id, get_api_key
 from .database import get_db
 from .server_config import get_server_config_manager
 from .utils import validate_scim_id
 
 # Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_remote_address,
+    strategy=settings.rate_limit_strategy,
+    storage_uri=settings.rate_limit_storage_uri,
+)
 
 
 def create_path_based_routers() -> List[APIRouter]:
@@ -46,7 +51,8 @@ def create_path_based_routers() -> List[APIRouter]:
     # User endpoints with path-based server ID
     user_router = APIRouter(
         prefix="/scim-identifier/{server_id}/scim/v2/Users",
-        tags=["Users (Path-based)"]
+        tags=["Users (Path-based)"],
+        route_class=ORJSONRoute
     )
     
     user_endpoints = BaseEntityEndpoint(
@@ -65,7 +71,7 @@ def create_path_based_routers() -> List[APIRouter]:
     
     # Add password change endpoint to user router
     @user_router.patch("/{user_id}/password")
-    @limiter.limit(f"{settings.rate_limit_create}/{settings.rate_limit_window}minute")
+    @limiter.limit(CREATE_RATE_LIMIT)
     async def change_user_password(
         user_id: str,
         request: Request,
@@ -147,7 +153,8 @@ def create_path_based_routers() -> List[APIRouter]:
     # Group endpoints with path-based server ID
     group_router = APIRouter(
         prefix="/scim-identifier/{server_id}/scim/v2/Groups",
-        tags=["Groups (Path-based)"]
+        tags=["Groups (Path-based)"],
+        route_class=ORJSONRoute
     )
     
     group_endpoints = BaseEntityEndpoint(
@@ -168,7 +175,8 @@ def create_path_based_routers() -> List[APIRouter]:
     # Entitlement endpoints with path-based server ID
     entitlement_router = APIRouter(
         prefix="/scim-identifier/{server_id}/scim/v2/Entitlements",
-        tags=["Entitlements (Path-based)"]
+        tags=["Entitlements (Path-based)"],
+        route_class=ORJSONRoute
     )
     
     entitlement_endpoints = BaseEntityEndpoint(
@@ -189,7 +197,8 @@ def create_path_based_routers() -> List[APIRouter]:
     # Create SCIM discovery endpoints with path-based server ID
     scim_router = APIRouter(
         prefix="/scim-identifier/{server_id}/scim/v2",
-        tags=["SCIM Discovery (Path-based)"]
+        tags=["SCIM Discovery (Path-based)"],
+        route_class=ORJSONRoute
     )
     
     # Import and register SCIM discovery endpoints
@@ -197,11 +206,8 @@ def create_path_based_routers() -> List[APIRouter]:
     
     # Register the endpoints with the path-based router
     scim_router.add_api_route("/ServiceProviderConfig", get_service_provider_config, methods=["GET"])
-    scim_router.add_api_route("/ServiceProviderConfig/", get_service_provider_config, methods=["GET"])
     scim_router.add_api_route("/ResourceTypes", get_resource_types, methods=["GET"])
-    scim_router.add_api_route("/ResourceTypes/", get_resource_types, methods=["GET"])
     scim_router.add_api_route("/Schemas", get_schemas, methods=["GET"])
-    scim_router.add_api_route("/Schemas/", get_schemas, methods=["GET"])
     scim_router.add_api_route("/Schemas/{schema_urn}", get_schema_by_urn, methods=["GET"])
     
     routers.append(scim_router)
@@ -0,0 +1,32 @@
+"""
+Trailing-slash normalization for incoming request paths.
+
+Clients such as Okta call SCIM endpoints both with and without a trailing slash. Rather
+than registering every route twice, the path is normalized before routing so each
+endpoint needs a single route (registered without the trailing slash), which also keeps
+the route table that Starlette scans per request half the size.
+
+Only SCIM API paths are normalized: mounted sub-apps such as the frontend's StaticFiles
+redirect between slashed and unslashed paths themselves, and stripping their slash would
+make those redirects loop.
+"""
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class StripTrailingSlashMiddleware:
+    """ASGI middleware removing a single trailing slash from HTTP request paths under a prefix."""
+
+    def __init__(self, app: ASGIApp, prefix: str = "/scim-identifier/"):
+        self.app = app
+        self.prefix = prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path[-1] == "/" and path.startswith(self.prefix) and len(path) > len(self.prefix):
+                scope = dict(scope, path=path[:-1])
+                raw_path = scope.get("raw_path")
+                if raw_path is not None and raw_path.endswith(b"/"):
+                    scope["raw_path"] = raw_path[:-1]
+        await self.app(scope, receive, send)
@@ -11,46 +11,313 @@ The schemas are generated at runtime to ensure they accurately reflect
 the current state of the system and each server's unique configuration.
 """
 
-from typing import Dict, Any, List, Optional
-from sqlalchemy import inspect
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple, Callable
+
+import orjson
 from sqlalchemy.orm import Session
-from loguru import logger
 
-from .models import User, Group, Entitlement
-from .config import settings
-from .server_config import get_server_config_manager
+from .server_config import get_server_config_manager, register_config_change_hook
+
+
+# Core schema URNs served by every server
+URN_USER = "urn:ietf:params:scim:schemas:core:2.0:User"
+URN_GROUP = "urn:ietf:params:scim:schemas:core:2.0:Group"
+URN_ENTITLEMENT = "urn:okta:scim:schemas:core:1.0:Entitlement"
+
+# Resource type definitions are identical for every server, so they are built once and
+# shared read-only; servers only differ in which of them are enabled.
+_USER_RESOURCE_TYPE = MappingProxyType({
+    "schemas": (URN_USER,),
+    "id": "User",
+    "name": "User",
+    "description": "User Account",
+    "endpoint": "/Users",
+    "schema": URN_USER
+})
+
+_GROUP_RESOURCE_TYPE = MappingProxyType({
+    "schemas": (URN_GROUP,),
+    "id": "Group",
+    "name": "Group",
+    "description": "Group",
+    "endpoint": "/Groups",
+    "schema": URN_GROUP
+})
+
+_ENTITLEMENT_RESOURCE_TYPE = MappingProxyType({
+    "schemas": (URN_ENTITLEMENT,),
+    "id": "Entitlement",
+    "name": "Entitlement",
+    "description": "Entitlement",
+    "endpoint": "/Entitlements",
+    "schema": URN_ENTITLEMENT
+})
+
+_ALL_RESOURCE_TYPES = (
+    ("User", _USER_RESOURCE_TYPE),
+    ("Group", _GROUP_RESOURCE_TYPE),
+    ("Entitlement", _ENTITLEMENT_RESOURCE_TYPE),
+)
+
+# Shared read-only default for optional config sections
+_EMPTY_DICT = MappingProxyType({})
+
+# Resource types enabled when a server config does not list them
+_DEFAULT_ENABLED_TYPES = ("User", "Group", "Entitlement")
+
+# Static attribute definitions shared by the schema builders. Generated schemas are
+# memoized and read-only, so every schema can reference the same objects.
+_SCHEMAS_ATTR = {
+    "name": "schemas",
+    "type": "string",
+    "multiValued": True,
+    "description": "URIs of schemas used to define the attributes of the current resource",
+    "required": True,
+    "caseExact": False,
+    "mutability": "readWrite",
+    "returned": "default",
+    "uniqueness": "none"
+}
+
+_EMAILS_ATTR = {
+    "name": "emails",
+    "type": "complex",
+    "multiValued": True,
+    "description": "Email addresses for the user",
+    "required": False,
+    "mutability": "readWrite",
+    "returned": "default",
+    "subAttributes": (
+        {
+            "name": "value",
+            "type": "string",
+            "multiValued": False,
+            "description": "Email address value",
+            "required": True,
+            "caseExact": False,
+            "mutability": "readWrite",
+            "returned": "default"
+        },
+        {
+            "name": "primary",
+            "type": "boolean",
+            "multiValued": False,
+            "description": "A Boolean value indicating the 'primary' or preferred attribute value for this attribute",
+            "required": False,
+            "mutability": "readWrite",
+            "returned": "default"
+        }
+    )
+}
+
+_NAME_ATTR = {
+    "name": "name",
+    "type": "complex",
+    "multiValued": False,
+    "description": "The components of the user's real name",
+    "required": False,
+    "mutability": "readWrite",
+    "returned": "default",
+    "subAttributes": (
+        {
+            "name": "givenName",
+            "type": "string",
+            "multiValued": False,
+            "description": "The given name of the User",
+            "required": False,
+            "caseExact": False,
+            "mutability": "readWrite",
+            "returned": "default"
+        },
+        {
+            "name": "familyName",
+            "type": "string",
+            "multiValued": False,
+            "description": "The family name of the User",
+            "required": False,
+            "caseExact": False,
+            "mutability": "readWrite",
+            "returned": "default"
+        }
+    )
+}
+
+_MEMBER_VALUE_SUBATTR = {
+    "name": "value",
+    "type": "string",
+    "multiValued": False,
+    "description": "Identifier of the member of this Group",
+    "required": False,
+    "caseExact": False,
+    "mutability": "readOnly",
+    "returned": "default",
+    "uniqueness": "none"
+}
+
+_MEMBER_DISPLAY_SUBATTR = {
+    "name": "display",
+    "type": "string",
+    "multiValued": False,
+    "description": "A human-readable name for the member",
+    "required": False,
+    "caseExact": False,
+    "mutability": "readOnly",
+    "returned": "default",
+    "uniqueness": "none"
+}
+
+_MEMBER_REF_SUBATTR = {
+    "name": "$ref",
+    "type": "reference",
+    "multiValued": False,
+    "description": "The URI of the corresponding resource",
+    "required": False,
+    "caseExact": False,
+    "mutability": "readOnly",
+    "returned": "default",
+    "uniqueness": "none"
+}
+
+_MEMBERS_ATTR = {
+    "name": "members",
+    "type": "complex",
+    "multiValued": True,
+    "description": "A list of members of the Group",
+    "required": False,
+    "caseExact": False,
+    "mutability": "readWrite",
+    "returned": "default",
+    "subAttributes": (_MEMBER_VALUE_SUBATTR, _MEMBER_DISPLAY_SUBATTR, _MEMBER_REF_SUBATTR)
+}
+
+# Generated schema documents keyed by (server_id, schema URN). Each entry remembers the
+# config object it was built from, so a reloaded or updated config is rebuilt. Cached
+# schemas are shared between callers and must be treated as read-only.
+_SCHEMA_CACHE: Dict[Tuple[str, str], Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+
+# Lists of enabled schemas keyed by (server_id, "dict" | "bytes", enabled-types bitmask)
+_SCHEMA_LIST_CACHE: Dict[Tuple[str, str, int], Tuple[Dict[str, Any], List[Any]]] = {}
+
+# Serialized schema documents keyed by (server_id, schema URN). Each entry remembers the
+# config object it was rendered from, so a reloaded or updated config is re-serialized.
+_JSON_CACHE: Dict[Tuple[str, str], Tuple[Dict[str, Any], bytes]] = {}
+
+
+# ResourceTypes ListResponses keyed by enabled-types bitmask. Resource type definitions
+# are static, so servers enabling the same types share one response and it never
+# needs invalidating.
+_RESOURCE_TYPES_RESPONSES: Dict[int, MappingProxyType] = {}
+_RESOURCE_TYPES_BYTES: Dict[int, bytes] = {}
+
+
+# Shared generators by server ID (see DynamicSchemaGenerator.for_server)
+_GENERATORS: Dict[str, "DynamicSchemaGenerator"] = {}
+
+
+def invalidate_schema_caches(server_id: str) -> None:
+    """Drop every cached schema artifact of a server, e.g. after its configuration changed or was evicted."""
+    _GENERATORS.pop(server_id, None)
+    # Runs on request threads while others insert entries: snapshot the keys in one
+    # C-level call instead of iterating the live dicts, and tolerate concurrent removals
+    for cache in (_SCHEMA_CACHE, _SCHEMA_LIST_CACHE, _JSON_CACHE):
+        for key in tuple(cache):
+            if key[0] == server_id:
+                cache.pop(key, None)
+
+
+register_config_change_hook(invalidate_schema_caches)
+
+
+def dump_json(content: Any) -> bytes:
+    """Serialize content with the compact UTF-8 encoding ORJSONResponse uses."""
+    return orjson.dumps(content)
+
+
+def list_response_bytes(resources: List[bytes]) -> bytes:
+    """Wrap already-serialized resources in a SCIM ListResponse envelope."""
+    count = len(resources)
+    return (
+        b'{"schemas":["urn:ietf:params:scim:api:messages:2.0:ListResponse"],'
+        b'"totalResults":%d,"startIndex":1,"itemsPerPage":%d,"Resources":[' % (count, count)
+        + b",".join(resources)
+        + b"]}"
+    )
+
+
+# _JSON_CACHE key suffix for the complete /Schemas ListResponse of a server
+_SCHEMAS_RESPONSE_KEY = "ListResponse"
 
 
 class DynamicSchemaGenerator:
     """Generates SCIM schema definitions dynamically based on server configuration."""
     
+    # Instantiated per request (or pooled via for_server), so avoid a per-instance __dict__
+    __slots__ = ("db", "server_id", "server_config")
+    
     def __init__(self, db: Session, server_id: str):
         self.db = db
         self.server_id = server_id
         self.server_config = get_server_config_manager(db).get_server_config(server_id)
     
+    @classmethod
+    def for_server(cls, db: Session, server_id: str) -> "DynamicSchemaGenerator":
+        """
+        Get the shared generator for a server's current configuration.
+        
+        Generators hold no state beyond the server ID and its config, so one instance per
+        server is reused for as long as the config object stays the same. Pooled
+        generators do not keep a session (db is None); nothing reads it after __init__.
+        """
+        return cls.for_config(server_id, get_server_config_manager(db).get_server_config(server_id))
+    
+    @classmethod
+    def for_config(cls, server_id: str, server_config: Dict[str, Any]) -> "DynamicSchemaGenerator":
+        """Get the shared generator for an already loaded server config (no session needed)."""
+        generator = _GENERATORS.get(server_id)
+        if generator is None or generator.server_config is not server_config:
+            generator = cls.__new__(cls)
+            generator.db = None
+            generator.server_id = server_id
+            generator.server_config = server_config
+            _GENERATORS[server_id] = generator
+        return generator
+    
+    def _get_cached_schema(self, schema_urn: str, build: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the shared schema for this server, building it on a cache miss."""
+        key = (self.server_id, schema_urn)
+        cached = _SCHEMA_CACHE.get(key)
+        if cached is not None and cached[0] is self.server_config:
+            return cached[1]
+        
+        schema = build()
+        _SCHEMA_CACHE[key] = (self.server_config, schema)
+        return schema
+    
     def get_user_schema(self) -> Dict[str, Any]:
+        """Get the User schema for this server (shared, read-only)."""
+        return self._get_cached_schema(URN_USER, self._build_user_schema)
+    
+    def get_group_schema(self) -> Dict[str, Any]:
+        """Get the Group schema for this server (shared, read-only)."""
+        return self._get_cached_schema(URN_GROUP, self._build_group_schema)
+    
+    def get_entitlement_schema(self) -> Dict[str, Any]:
+        """Get the Entitlement schema for this server (shared, read-only)."""
+        return self._get_cached_schema(URN_ENTITLEMENT, self._build_entitlement_schema)
+    
+    def _build_user_schema(self) -> Dict[str, Any]:
         """Generate User schema based on server-specific configuration."""
-        user_attrs = self.server_config.get("user_attributes", {})
-        required_attrs = user_attrs.get("required_attributes", ["userName"])
-        optional_attrs = user_attrs.get("optional_attributes", ["displayName", "emails", "name", "active"])
-        complex_attrs = user_attrs.get("complex_attributes", {})
+        user_attrs = self.server_config.get("user_attributes", _EMPTY_DICT)
+        required_attrs = self.server_config["_user_required_attrs"]
+        optional_attrs = self.server_config["_user_optional_attrs"]
+        complex_attrs = self.server_config["_user_complex_attrs"]
         
         attributes = []
         
         # Core SCIM attributes - including required 'schemas' field per RFC 7643 §3.1
         attributes.extend([
-            {
-                "name": "schemas",
-                "type": "string",
-                "multiValued": True,
-                "description": "URIs of schemas used to define the attributes of the current resource",
-                "required": True,
-                "caseExact": False,
-                "mutability": "readWrite",
-                "returned": "default",
-                "uniqueness": "none"
-            },
+            _SCHEMAS_ATTR,
             {
                 "name": "id",
                 "type": "string",
@@ -104,7 +371,7 @@ class DynamicSchemaGenerator:
         
         # Server-specific optional attributes
         for attr_name in optional_attrs:
-            if attr_name == "displayName" and "displayName" not in required_attrs:
+            if attr_name == "displayName" and "displayName" not in self.server_config["_user_required_set"]:
                 attributes.append({
                     "name": "displayName",
                     "type": "string",
@@ -128,106 +395,35 @@ class DynamicSchemaGenerator:
                 })
         
         # Server-specific complex attributes
-        for attr_name, attr_config in complex_attrs.items():
+        for attr_name, attr_config in complex_attrs:
             if attr_name == "emails":
-                attributes.append({
-                    "name": "emails",
-                    "type": "complex",
-                    "multiValued": True,
-                    "description": "Email addresses for the user",
-                    "required": False,
-                    "mutability": "readWrite",
-                    "returned": "default",
-                    "subAttributes": [
-                        {
-                            "name": "value",
-                            "type": "string",
-                            "multiValued": False,
-                            "description": "Email address value",
-                            "required": True,
-                            "caseExact": False,
-                            "mutability": "readWrite",
-                            "returned": "default"
-                        },
-                        {
-                            "name": "primary",
-                            "type": "boolean",
-                            "multiValued": False,
-                            "description": "A Boolean value indicating the 'primary' or preferred attribute value for this attribute",
-                            "required": False,
-                            "mutability": "readWrite",
-                            "returned": "default"
-                        }
-                    ]
-                })
+                attributes.append(_EMAILS_ATTR)
             elif attr_name == "name":
-                attributes.append({
-                    "name": "name",
-                    "type": "complex",
-                    "multiValued": False,
-                    "description": "The components of the user's real name",
-                    "required": False,
-                    "mutability": "readWrite",
-                    "returned": "default",
-                    "subAttributes": [
-                        {
-                            "name": "givenName",
-                            "type": "string",
-                            "multiValued": False,
-                            "description": "The given name of the User",
-                            "required": False,
-                            "caseExact": False,
-                            "mutability": "readWrite",
-                            "returned": "default"
-                        },
-                        {
-                            "name": "familyName",
-                            "type": "string",
-                            "multiValued": False,
-                            "description": "The family name of the User",
-                            "required": False,
-                            "caseExact": False,
-                            "mutability": "readWrite",
-                            "returned": "default"
-                        }
-                    ]
-                })
+                attributes.append(_NAME_ATTR)
         
         # Server-specific custom attributes
-        custom_attrs = user_attrs.get("custom_attributes", {})
-        for attr_name, attr_config in custom_attrs.items():
-            attributes.append(attr_config)
+        attributes.extend(user_attrs.get("custom_attributes", _EMPTY_DICT).values())
         
         return {
-            "schemas": ["urn:ietf:params:scim:schemas:core:2.0:User"],
-            "id": "urn:ietf:params:scim:schemas:core:2.0:User",
+            "schemas": [URN_USER],
+            "id": URN_USER,
             "name": "User",
             "description": "User Account",
-            "attributes": attributes
+            "attributes": tuple(attributes)
         }
     
-    def get_group_schema(self) -> Dict[str, Any]:
+    def _build_group_schema(self) -> Dict[str, Any]:
         """Generate Group schema based on server-specific configuration."""
-        group_attrs = self.server_config.get("group_attributes", {})
-        required_attrs = group_attrs.get("required_attributes", ["displayName"])
-        optional_attrs = group_attrs.get("optional_attributes", ["description"])
-        complex_attrs = group_attrs.get("complex_attributes", {})
+        group_attrs = self.server_config.get("group_attributes", _EMPTY_DICT)
+        required_attrs = self.server_config["_group_required_attrs"]
+        optional_attrs = self.server_config["_group_optional_attrs"]
+        complex_attrs = self.server_config["_group_complex_attrs"]
         
         attributes = []
         
         # Core SCIM attributes - including required 'schemas' field per RFC 7643 §3.1
         attributes.extend([
-            {
-                "name": "schemas",
-                "type": "string",
-                "multiValued": True,
-                "description": "URIs of schemas used to define the attributes of the current resource",
-                "required": True,
-                "caseExact": False,
-                "mutability": "readWrite",
-                "returned": "default",
-                "uniqueness": "none"
-            },
+            _SCHEMAS_ATTR,
             {
                 "name": "id",
                 "type": "string",
@@ -271,90 +467,35 @@ class DynamicSchemaGenerator:
                 })
         
         # Server-specific complex attributes
-        for attr_name, attr_config in complex_attrs.items():
+        for attr_name, attr_config in complex_attrs:
             attributes.append(attr_config)
         
         # Add members attribute for group membership
-        attributes.append({
-            "name": "members",
-            "type": "complex",
-            "multiValued": True,
-            "description": "A list of members of the Group",
-            "required": False,
-            "caseExact": False,
-            "mutability": "readWrite",
-            "returned": "default",
-            "subAttributes": [
-                {
-                    "name": "value",
-                    "type": "string",
-                    "multiValued": False,
-                    "description": "Identifier of the member of this Group",
-                    "required": False,
-                    "caseExact": False,
-                    "mutability": "readOnly",
-                    "returned": "default",
-                    "uniqueness": "none"
-                },
-                {
-                    "name": "display",
-                    "type": "string",
-                    "multiValued": False,
-                    "description": "A human-readable name for the member",
-                    "required": False,
-                    "caseExact": False,
-                    "mutability": "readOnly",
-                    "returned": "default",
-                    "uniqueness": "none"
-                },
-                {
-                    "name": "$ref",
-                    "type": "reference",
-                    "multiValued": False,
-                    "description": "The URI of the corresponding resource",
-                    "required": False,
-                    "caseExact": False,
-                    "mutability": "readOnly",
-                    "returned": "default",
-                    "uniqueness": "none"
-                }
-            ]
-        })
+        attributes.append(_MEMBERS_ATTR)
         
         # Server-specific custom attributes
-        custom_attrs = group_attrs.get("custom_attributes", {})
-        for attr_name, attr_config in custom_attrs.items():
-            attributes.append(attr_config)
+        attributes.extend(group_attrs.get("custom_attributes", _EMPTY_DICT).values())
         
         return {
-            "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Group"],
-            "id": "urn:ietf:params:scim:schemas:core:2.0:Group",
+            "schemas": [URN_GROUP],
+            "id": URN_GROUP,
             "name": "Group",
             "description": "Group",
-            "attributes": attributes
+            "attributes": tuple(attributes)
         }
     
-    def get_entitlement_schema(self) -> Dict[str, Any]:
+    def _build_entitlement_schema(self) -> Dict[str, Any]:
         """Generate Entitlement schema based on server-specific configuration."""
-        entitlement_types = self.server_config.get("entitlement_types", [])
-        
-        # Generate canonical values from server-specific entitlement types
-        canonical_values = []
-        for entitlement in entitlement_types:
-            canonical_values.extend(entitlement.get("canonical_values", []))
+        # Generate canonical values from server-specific entitlement types (the built
+        # schema is cached per config object in _SCHEMA_CACHE, so this runs once per config)
+        canonical_values = [
+            value
+            for entitlement in self.server_config.get("entitlement_types", ())
+            for value in entitlement.get("canonical_values", ())
+        ]
         
         attributes = [
-            {
-                "name": "schemas",
-                "type": "string",
-                "multiValued": True,
-                "description": "URIs of schemas used to define the attributes of the current resource",
-                "required": True,
-                "caseExact": False,
-                "mutability": "readWrite",
-                "returned": "default",
-                "uniqueness": "none"
-            },
+            _SCHEMAS_ATTR,
             {
                 "name": "id",
                 "type": "string",
@@ -402,79 +543,141 @@ class DynamicSchemaGenerator:
         ]
         
         return {
-            "schemas": ["urn:okta:scim:schemas:core:1.0:Entitlement"],
-            "id": "urn:okta:scim:schemas:core:1.0:Entitlement",
+            "schemas": [URN_ENTITLEMENT],
+            "id": URN_ENTITLEMENT,
             "name": "Entitlement",
             "description": "Entitlement",
-            "attributes": attributes
+            "attributes": tuple(attributes)
         }
     
     def get_resource_types(self) -> List[Dict[str, Any]]:
         """Get resource types based on server-specific enabled types."""
-        enabled_types = self.server_config.get("enabled_resource_types", ["User", "Group", "Entitlement"])
-        
-        resource_types = []
-        
-        if "User" in enabled_types:
-            resource_types.append({
-                "schemas": ["urn:ietf:params:scim:schemas:core:2.0:User"],
-                "id": "User",
-                "name": "User",
-                "description": "User Account",
-                "endpoint": "/Users",
-                "schema": "urn:ietf:params:scim:schemas:core:2.0:User"
-            })
-        
-        if "Group" in enabled_types:
-            resource_types.append({
-                "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Group"],
-                "id": "Group",
-                "name": "Group",
-                "description": "Group",
-                "endpoint": "/Groups",
-                "schema": "urn:ietf:params:scim:schemas:core:2.0:Group"
-            })
-        
-        if "Entitlement" in enabled_types:
-            resource_types.append({
-                "schemas": ["urn:okta:scim:schemas:core:1.0:Entitlement"],
-                "id": "Entitlement",
-                "name": "Entitlement",
-                "description": "Entitlement",
-                "endpoint": "/Entitlements",
-                "schema": "urn:okta:scim:schemas:core:1.0:Entitlement"
+        return list(self.get_resource_types_response()["Resources"])
+    
+    def get_resource_types_response(self) -> Mapping[str, Any]:
+        """Get the ResourceTypes ListResponse for the enabled types (shared, read-only)."""
+        mask = self._enabled_types_mask()
+        response = _RESOURCE_TYPES_RESPONSES.get(mask)
+        if response is None:
+            resource_types = tuple(
+                resource_type
+                for bit, (_, resource_type) in zip((1, 2, 4), _ALL_RESOURCE_TYPES)
+                if mask & bit
+            )
+            # Read-only, since its serialized bytes are cached alongside it
+            response = MappingProxyType({
+                "schemas": ("urn:ietf:params:scim:api:messages:2.0:ListResponse",),
+                "totalResults": len(resource_types),
+                "startIndex": 1,
+                "itemsPerPage": len(resource_types),
+                "Resources": resource_types
             })
+            _RESOURCE_TYPES_RESPONSES[mask] = response
+        return response
+    
+    def get_resource_types_response_bytes(self) -> bytes:
+        """Get the ResourceTypes ListResponse serialized to JSON bytes."""
+        mask = self._enabled_types_mask()
+        content = _RESOURCE_TYPES_BYTES.get(mask)
+        if content is None:
+            response = self.get_resource_types_response()
+            # The shared resource type definitions are read-only mappings, which the
+            # JSON encoder only accepts as plain dicts
+            content = dump_json({**response, "Resources": [dict(rt) for rt in response["Resources"]]})
+            _RESOURCE_TYPES_BYTES[mask] = content
+        return content
+    
+    def _enabled_types_mask(self) -> int:
+        """Encode the enabled resource types as a bitmask (User=1, Group=2, Entitlement=4)."""
+        enabled_types = self.server_config.get("enabled_resource_types", _DEFAULT_ENABLED_TYPES)
+        return (
+            (1 if "User" in enabled_types else 0)
+            | (2 if "Group" in enabled_types else 0)
+            | (4 if "Entitlement" in enabled_types else 0)
+        )
+    
+    def _get_cached_schema_list(self, kind: str, getters: Tuple[Callable[["DynamicSchemaGenerator"], Any], ...]) -> List[Any]:
+        """Return the shared list of enabled schemas (or their bytes) for this server."""
+        mask = self._enabled_types_mask()
+        key = (self.server_id, kind, mask)
+        cached = _SCHEMA_LIST_CACHE.get(key)
+        if cached is not None and cached[0] is self.server_config:
+            return cached[1]
         
-        return resource_types
+        schemas = [getter(self) for bit, getter in zip((1, 2, 4), getters) if mask & bit]
+        _SCHEMA_LIST_CACHE[key] = (self.server_config, schemas)
+        return schemas
+    
+    # Unbound getters in bitmask order, so cache hits create no bound methods
+    _SCHEMA_GETTERS = (get_user_schema, get_group_schema, get_entitlement_schema)
     
     def get_all_schemas(self) -> List[Dict[str, Any]]:
-        """Get all schemas based on server-specific enabled types."""
-        enabled_types = self.server_config.get("enabled_resource_types", ["User", "Group", "Entitlement"])
-        
-        schemas = []
-        
-        if "User" in enabled_types:
-            schemas.append(self.get_user_schema())
+        """Get all schemas based on server-specific enabled types (shared, read-only)."""
+        return self._get_cached_schema_list("dict", self._SCHEMA_GETTERS)
+    
+    def _get_cached_json(self, schema_urn: str, build: Callable[[], Dict[str, Any]]) -> bytes:
+        """Return the serialized schema for this server, building it on a cache miss."""
+        key = (self.server_id, schema_urn)
+        cached = _JSON_CACHE.get(key)
+        if cached is not None and cached[0] is self.server_config:
+            return cached[1]
         
-        if "Group" in enabled_types:
-            schemas.append(self.get_group_schema())
+        content = dump_json(build())
+        _JSON_CACHE[key] = (self.server_config, content)
+        return content
+    
+    def get_user_schema_bytes(self) -> bytes:
+        """Get the User schema serialized to JSON bytes."""
+        return self._get_cached_json(URN_USER, self.get_user_schema)
+    
+    def get_group_schema_bytes(self) -> bytes:
+        """Get the Group schema serialized to JSON bytes."""
+        return self._get_cached_json(URN_GROUP, self.get_group_schema)
+    
+    def get_entitlement_schema_bytes(self) -> bytes:
+        """Get the Entitlement schema serialized to JSON bytes."""
+        return self._get_cached_json(URN_ENTITLEMENT, self.get_entitlement_schema)
+    
+    _SCHEMA_BYTES_GETTERS = (get_user_schema_bytes, get_group_schema_bytes, get_entitlement_schema_bytes)
+    
+    def get_all_schemas_bytes(self) -> List[bytes]:
+        """Get all enabled schemas serialized to JSON bytes, in get_all_schemas order."""
+        return self._get_cached_schema_list("bytes", self._SCHEMA_BYTES_GETTERS)
+    
+    def get_schemas_response_bytes(self) -> bytes:
+        """Get the /Schemas ListResponse of all enabled schemas, serialized once per config."""
+        key = (self.server_id, _SCHEMAS_RESPONSE_KEY)
+        cached = _JSON_CACHE.get(key)
+        if cached is not None and cached[0] is self.server_config:
+            return cached[1]
         
-        if "Entitlement" in enabled_types:
-            schemas.append(self.get_entitlement_schema())
+        content = list_response_bytes(self.get_all_schemas_bytes())
+        _JSON_CACHE[key] = (self.server_config, content)
+        return content
+    
+    def get_schema_bytes_by_urn(self, schema_urn: str) -> Optional[bytes]:
+        """Get a schema by URN serialized to JSON bytes."""
+        if schema_urn == URN_USER:
+            return self.get_user_schema_bytes()
+        elif schema_urn == URN_GROUP:
+            return self.get_group_schema_bytes()
+        elif schema_urn == URN_ENTITLEMENT:
+            return self.get_entitlement_schema_bytes()
         
-        return schemas
+        schema = self.get_schema_by_urn(schema_urn)
+        return dump_json(schema) if schema is not None else None
     
     def get_schema_by_urn(self, schema_urn: str) -> Optional[Dict[str, Any]]:
         """Get schema by URN based on server-specific configuration."""
-        if schema_urn == "urn:ietf:params:scim:schemas:core:2.0:User":
+        if schema_urn == URN_USER:
             return self.get_user_schema()
-        elif schema_urn == "urn:ietf:params:scim:schemas:core:2.0:Group":
+        elif schema_urn == URN_GROUP:
             return self.get_group_schema()
-        elif schema_urn == "urn:okta:scim:schemas:core:1.0:Entitlement":
+        elif schema_urn == URN_ENTITLEMENT:
             return self.get_entitlement_schema()
         else:
             # Check for custom schemas in server configuration
-            schema_extensions = self.server_config.get("schema_extensions", {})
+            schema_extensions = self.server_config.get("schema_extensions", _EMPTY_DICT)
             if schema_urn in schema_extensions:
                 return schema_extensions[schema_urn]
         
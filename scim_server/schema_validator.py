@@ -5,488 +5,841 @@ This module provides comprehensive SCIM schema validation that is dynamic based
 server-specific configurations. Each server ID can have unique attributes and validation rules.
 """
 
-from typing import Dict, Any, List, Optional
+import sys
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple, Callable, Mapping, Iterable, FrozenSet, NoReturn
 from fastapi import HTTPException
+from sqlalchemy.orm import Session
 from loguru import logger
 
 from .schema_definitions import DynamicSchemaGenerator
-from .server_config import get_server_config_manager
+from .server_config import register_config_change_hook
+
+
+# Error detail templates are read-only mappings; only the dynamic keys are overlaid
+Detail = Mapping[str, Any]
+
+# (validator, entry, value, resource_type) -> validated value
+TypeValidator = Callable[["SchemaValidator", "Entry", Any, str], Any]
+
+# (validator, data, allow_unknown, check_required) -> validated data
+CreateValidator = Callable[["SchemaValidator", Dict[str, Any], bool, bool], Dict[str, Any]]
+
+# (validator, data, allow_unknown) -> validated data
+UpdateValidator = Callable[["SchemaValidator", Dict[str, Any], bool], Dict[str, Any]]
+
+# (validator, value, resource_type) -> validated value
+ValueValidator = Callable[["SchemaValidator", Any, str], Any]
+
+
+@dataclass(slots=True, frozen=True)
+class Entry:
+    """Precompiled view of a schema attribute, so validation never re-reads the definition.
+    
+    Attribute flags (required, readOnly, multi-valued, ...) are resolved to plain booleans
+    at compile time; with slots each test is a single attribute load, which is as cheap
+    as masking a packed int and keeps the call sites readable.
+    """
+    name: str
+    type: str
+    required: bool
+    is_readonly: bool
+    multi: bool
+    canonical_values: List[Any]
+    canonical_set: Optional[FrozenSet[Any]]  # scalar types only
+    type_validator: Optional[TypeValidator]
+    required_missing_detail: Detail
+    null_detail: Detail
+    type_mismatch_detail: Optional[Detail]
+    canonical_detail: Optional[Detail]
+    readonly_modification_detail: Detail
+    patch_readonly_detail: Detail
+    add_single_valued_detail: Detail
+    plain_string_list: bool
+    sub_plan: Optional[List["Entry"]] = None
+    validate: Optional[ValueValidator] = None
+
+
+@dataclass(slots=True, frozen=True)
+class ResourcePlan:
+    """Precompiled validation plan for one resource type.
+    
+    Per-attribute flags never need scanning at request time: the generated validators
+    bake required/readOnly/type decisions into straight-line code, and the attribute
+    subsets requests iterate (required entries, returned-policy names) are kept as their
+    own lists.
+    """
+    attr_by_name: Dict[str, Entry]
+    create_required: List[Entry]
+    returned_always: List[str]
+    returned_default: List[str]
+    returned_request: List[str]
+    returned_by_default: List[str]
+    create_validator: CreateValidator
+    update_validator: UpdateValidator
+
+
+def _raise_validation_error(template: Detail, **dynamic: Any) -> NoReturn:
+    """Raise a 400 SCIM validation error from a precompiled detail template."""
+    raise HTTPException(status_code=400, detail={**template, **dynamic})
+
+
+# Type checks compare exact types: request bodies come from a JSON decoder, which never
+# produces subclasses, and `type(value) is int` also keeps booleans out of integers.
+
+
+def _validate_string(validator: "SchemaValidator", entry: Entry, value: Any, resource_type: str) -> Any:
+    """Validate a string attribute value."""
+    if type(value) is not str:
+        _raise_validation_error(entry.type_mismatch_detail, provided_value=value)
+    return value
+
+
+def _validate_boolean(validator: "SchemaValidator", entry: Entry, value: Any, resource_type: str) -> Any:
+    """Validate a boolean attribute value."""
+    if type(value) is not bool:
+        _raise_validation_error(entry.type_mismatch_detail, provided_value=value)
+    return value
+
+
+def _validate_integer(validator: "SchemaValidator", entry: Entry, value: Any, resource_type: str) -> Any:
+    """Validate an integer attribute value (booleans are not integers in SCIM)."""
+    if type(value) is not int:
+        _raise_validation_error(entry.type_mismatch_detail, provided_value=value)
+    return value
+
+
+# Type validators by SCIM attribute type; complex attributes get one compiled per
+# attribute (_compile_complex_validator) and other types are not type-checked
+_TYPE_VALIDATORS: Dict[str, TypeValidator] = {
+    "string": _validate_string,
+    "boolean": _validate_boolean,
+    "integer": _validate_integer,
+}
+
+# Python types of the scalar SCIM types, for checks inlined into compiled validators
+_SCALAR_TYPES: Dict[str, type] = {"string": str, "boolean": bool, "integer": int}
+
+
+def _compile_complex_validator(sub_plan: List[Entry], type_mismatch_detail: Detail) -> TypeValidator:
+    """Compile the type validator of one complex attribute.
+    
+    Sub-attributes are walked from a prebuilt table in a single loop; scalar leaves get
+    their type and canonical checks inline instead of a call per sub-attribute.
+    """
+    sub_table = tuple(
+        (
+            sub_entry.name,
+            sub_entry.required,
+            None if sub_entry.multi else _SCALAR_TYPES.get(sub_entry.type),
+            sub_entry.canonical_set,
+            sub_entry,
+        )
+        for sub_entry in sub_plan
+    )
+    
+    def validate_complex(validator: "SchemaValidator", entry: Entry, value: Any, resource_type: str) -> Any:
+        """Validate a complex attribute value and return only its known sub-attributes."""
+        if type(value) is not dict:
+            _raise_validation_error(type_mismatch_detail, provided_value=value)
+        
+        validated_complex = {}
+        for sub_attr_name, required, scalar_type, canonical_set, sub_entry in sub_table:
+            if sub_attr_name in value:
+                sub_value = value[sub_attr_name]
+                if sub_value is None:
+                    if required:
+                        _raise_validation_error(sub_entry.null_detail)
+                elif scalar_type is not None:
+                    if type(sub_value) is not scalar_type:
+                        _raise_validation_error(sub_entry.type_mismatch_detail, provided_value=sub_value)
+                    if canonical_set is not None and sub_value not in canonical_set:
+                        _raise_validation_error(
+                            sub_entry.canonical_detail,
+                            message=f"Field '{sub_attr_name}' value '{sub_value}' is not valid",
+                            provided_value=sub_value
+                        )
+                else:
+                    sub_value = sub_entry.validate(validator, sub_value, resource_type)
+                validated_complex[sub_attr_name] = sub_value
+            elif required:
+                _raise_validation_error(sub_entry.required_missing_detail)
+        
+        return validated_complex
+    
+    return validate_complex
+
+# Type mismatch wording by SCIM attribute type: (expected_type, description, help suffix)
+_TYPE_MISMATCH_TEXT: Dict[str, Tuple[str, str, str]] = {
+    "string": ("string", "a string", "to a string."),
+    "boolean": ("boolean", "a boolean", "to true or false."),
+    "integer": ("integer", "an integer", "to an integer."),
+    "complex": ("object", "an object", "to an object with the required sub-attributes."),
+}
+
+
+def _compile_value_validator(entry: Entry) -> ValueValidator:
+    """Specialize value validation for one attribute.
+    
+    Branches that depend only on the definition (type validator, canonical values,
+    multi-valuedness) are resolved here, so the returned function only checks the value.
+    """
+    required = entry.required
+    null_detail = entry.null_detail
+    type_validator = entry.type_validator
+    # Values of types without a scalar check may be unhashable (dicts, lists), so they
+    # are matched against the canonical values by equality instead of through the set
+    canonical_set = entry.canonical_set
+    if canonical_set is None and entry.canonical_values:
+        canonical_set = tuple(entry.canonical_values)
+    canonical_detail = entry.canonical_detail
+    attr_name = entry.name
+    
+    if canonical_set is not None:
+        def validate_single(validator: "SchemaValidator", value: Any, resource_type: str) -> Any:
+            if value is None:
+                if required:
+                    _raise_validation_error(null_detail)
+                return None
+            if type_validator is not None:
+                value = type_validator(validator, entry, value, resource_type)
+            if value not in canonical_set:
+                _raise_validation_error(
+                    canonical_detail,
+                    message=f"Field '{attr_name}' value '{value}' is not valid",
+                    provided_value=value
+                )
+            return value
+    elif type_validator is not None:
+        def validate_single(validator: "SchemaValidator", value: Any, resource_type: str) -> Any:
+            if value is None:
+                if required:
+                    _raise_validation_error(null_detail)
+                return None
+            return type_validator(validator, entry, value, resource_type)
+    else:
+        def validate_single(validator: "SchemaValidator", value: Any, resource_type: str) -> Any:
+            if value is None and required:
+                _raise_validation_error(null_detail)
+            return value
+    
+    if not entry.multi:
+        return validate_single
+    
+    plain_string_list = entry.plain_string_list
+    
+    def validate_multi(validator: "SchemaValidator", value: Any, resource_type: str) -> Any:
+        if plain_string_list and type(value) is list and all(type(item) is str for item in value):
+            return value[:]
+        # A scalar is accepted as a one-item list; a tuple avoids allocating a list for it
+        items = value if type(value) is list else (value,)
+        return [validate_single(validator, item, resource_type) for item in items]
+    
+    return validate_multi
+
+
+def _compile_entry(attr: Dict[str, Any], resource_type: str, server_id: str, parent_name: Optional[str] = None) -> Entry:
+    """Compile a schema attribute (and its sub-attributes) into an Entry.
+    
+    Error details are rendered here once, since the plan is specific to one server
+    and resource type; sub-attribute entries report their field as 'parent.name'.
+    """
+    # Interned names let dict lookups against request keys short-circuit on identity
+    attr_name = sys.intern(attr["name"])
+    attr_type = attr["type"]
+    # Only strings can be interned; configs may also declare integer or boolean enums
+    canonical_values = [
+        sys.intern(value) if type(value) is str else value
+        for value in attr.get("canonicalValues") or []
+    ]
+    sub_plan = None
+    if attr_type == "complex":
+        # Complex values are dicts, so they are never checked against canonical values
+        canonical_values = []
+        sub_plan = [
+            _compile_entry(sub_attr, resource_type, server_id, attr_name)
+            for sub_attr in attr.get("subAttributes", ())
+        ]
+    
+    def detail(**fields: Any) -> Detail:
+        return MappingProxyType({
+            "error": "SCIM_VALIDATION_ERROR",
+            **fields,
+            "resource_type": resource_type,
+            "server_id": server_id,
+        })
+    
+    if parent_name is None:
+        required_missing_detail = detail(
+            message=f"Required field '{attr_name}' is missing",
+            field=attr_name,
+            type="required_field_missing",
+            help=f"Add the '{attr_name}' field to your request. This field is required."
+        )
+    else:
+        required_missing_detail = detail(
+            message=f"Required sub-attribute '{attr_name}' is missing in '{parent_name}'",
+            field=f"{parent_name}.{attr_name}",
+            type="required_field_missing",
+            help=f"Add the '{attr_name}' field to '{parent_name}'. This field is required."
+        )
+    
+    type_mismatch_detail = None
+    if attr_type in _TYPE_MISMATCH_TEXT:
+        expected_type, description, help_suffix = _TYPE_MISMATCH_TEXT[attr_type]
+        type_mismatch_detail = detail(
+            message=f"Field '{attr_name}' must be {description}",
+            field=attr_name,
+            expected_type=expected_type,
+            type="type_mismatch",
+            help=f"Change the value of '{attr_name}' {help_suffix}"
+        )
+    
+    canonical_detail = None
+    if canonical_values:
+        canonical_detail = detail(
+            field=attr_name,
+            allowed_values=canonical_values,
+            type="invalid_canonical_value",
+            help=f"Use one of the allowed values: {', '.join(map(str, canonical_values))}"
+        )
+    
+    entry = Entry(
+        name=attr_name,
+        type=attr_type,
+        required=attr.get("required", False),
+        is_readonly=attr.get("mutability", "readWrite") == "readOnly",
+        multi=attr.get("multiValued", False),
+        canonical_values=canonical_values,
+        # Only scalar-typed values are known to be hashable once their type check passed
+        canonical_set=frozenset(canonical_values) if canonical_values and attr_type in _SCALAR_TYPES else None,
+        type_validator=(
+            _compile_complex_validator(sub_plan, type_mismatch_detail)
+            if sub_plan is not None else _TYPE_VALIDATORS.get(attr_type)
+        ),
+        required_missing_detail=required_missing_detail,
+        null_detail=detail(
+            message=f"Required field '{attr_name}' cannot be null",
+            field=attr_name,
+            provided_value=None,
+            type="required_field_missing",
+            help=f"Add a value for '{attr_name}'. This field is required."
+        ),
+        type_mismatch_detail=type_mismatch_detail,
+        canonical_detail=canonical_detail,
+        readonly_modification_detail=detail(
+            message=f"Cannot modify readOnly field '{attr_name}'",
+            field=attr_name,
+            type="readonly_field_modification",
+            help=f"The field '{attr_name}' is read-only and cannot be modified."
+        ),
+        patch_readonly_detail=detail(
+            message=f"Cannot modify readOnly field '{attr_name}'",
+            field=attr_name,
+            operation="PATCH",
+            type="readonly_field_modification",
+            help=f"The field '{attr_name}' is read-only and cannot be modified. Remove this field from your request."
+        ),
+        # Multi-valued strings without canonical values (e.g. 'schemas') can be accepted
+        # with a single all() pass when every item already is a string
+        plain_string_list=attr.get("multiValued", False) and attr_type == "string" and not canonical_values,
+        add_single_valued_detail=detail(
+            message=f"Cannot use 'add' operation on single-valued field '{attr_name}'",
+            field=attr_name,
+            operation="add",
+            type="invalid_operation_for_field_type",
+            help=f"The field '{attr_name}' is single-valued. Use 'replace' operation instead of 'add'."
+        ),
+        sub_plan=sub_plan
+    )
+    # The validator closes over the entry without it, which carries the same details
+    return replace(entry, validate=_compile_value_validator(entry))
+
+
+# Request-level errors (not tied to a compiled attribute) by template name:
+# (error type or None, message template, help template). Templates are filled from the
+# resource type, server ID and the context fields added to the detail.
+_ERROR_TEMPLATES: Dict[str, Tuple[Optional[str], str, str]] = {
+    "unknown_field": (
+        "unknown_field",
+        "Unknown field '{field}'",
+        "The field '{field}' does not exist in the {resource_type} schema for this server.",
+    ),
+    "unknown_patch_field": (
+        "unknown_field",
+        "Unknown field '{field}'",
+        "The field '{field}' does not exist in the {resource_type} schema for this server. "
+        "Check the schema definition for valid fields.",
+    ),
+    "unknown_resource_type": (
+        None,
+        "Unknown resource type '{resource_type}'",
+        "Resource type '{resource_type}' is not supported by this server.",
+    ),
+    "invalid_operation": (
+        "invalid_operation",
+        "Unsupported PATCH operation '{operation}'",
+        "Use one of the supported operations: add, remove, replace.",
+    ),
+}
+
+
+def _raise_scim_error(template_name: str, resource_type: str, server_id: str, **context: Any) -> NoReturn:
+    """Raise a 400 SCIM validation error rendered from _ERROR_TEMPLATES."""
+    error_type, message, help_text = _ERROR_TEMPLATES[template_name]
+    values = {"resource_type": resource_type, "server_id": server_id, **context}
+    detail = {
+        "error": "SCIM_VALIDATION_ERROR",
+        "message": message.format(**values),
+        **context,
+        "resource_type": resource_type,
+        "server_id": server_id,
+    }
+    if error_type is not None:
+        detail["type"] = error_type
+    detail["help"] = help_text.format(**values)
+    raise HTTPException(status_code=400, detail=detail)
+
+
+def _raise_unknown_field(field_name: str, resource_type: str, server_id: str) -> NoReturn:
+    """Raise the 400 error for a request field that is not in the resource schema."""
+    _raise_scim_error("unknown_field", resource_type, server_id, field=field_name)
+
+
+def _validator_namespace(entries: List[Entry], resource_type: str, server_id: str) -> Dict[str, Any]:
+    """Globals shared by the generated request validators of one resource type."""
+    return {
+        "_raise": _raise_validation_error,
+        "_raise_unknown_field": _raise_unknown_field,
+        "_known": frozenset(entry.name for entry in entries),
+        "_resource_type": resource_type,
+        "_server_id": server_id,
+    }
+
+
+# Generated validators reject unknown fields before looking at any value
+_UNKNOWN_FIELD_CHECK = [
+    "    if not allow_unknown:",
+    "        for key in data:",
+    "            if key not in _known:",
+    "                _raise_unknown_field(key, _resource_type, _server_id)",
+    "    out = {}",
+]
+
+
+def _emit_value_checks(lines: List[str], namespace: Dict[str, Any], index: int, entry: Entry) -> None:
+    """Emit the code validating a given value of one attribute into out[name].
+    
+    Single-valued scalars are null/type/canonical checked inline and everything else
+    goes through the entry's compiled value validator.
+    """
+    entry_ref = f"_e{index}"
+    namespace[entry_ref] = entry
+    name = repr(entry.name)
+    lines.append(f"        value = data[{name}]")
+    
+    if entry.multi or (entry.type not in _SCALAR_TYPES and entry.type_validator is not None):
+        lines.append(f"        out[{name}] = {entry_ref}.validate(validator, value, _resource_type)")
+        return
+    
+    lines.append("        if value is None:")
+    if entry.required:
+        lines.append(f"            _raise({entry_ref}.null_detail)")
+    else:
+        lines.append("            pass")
+    if entry.type in _SCALAR_TYPES:
+        lines.append(f"        elif type(value) is not {_SCALAR_TYPES[entry.type].__name__}:")
+        lines.append(f"            _raise({entry_ref}.type_mismatch_detail, provided_value=value)")
+    if entry.canonical_values:
+        canonical_ref = f"_c{index}"
+        namespace[canonical_ref] = (
+            entry.canonical_set if entry.canonical_set is not None else tuple(entry.canonical_values)
+        )
+        lines.append(f"        elif value not in {canonical_ref}:")
+        lines.append(f"            _raise({entry_ref}.canonical_detail, message=f\"Field '{{{entry_ref}.name}}' value '{{value}}' is not valid\", provided_value=value)")
+    lines.append(f"        out[{name}] = value")
+
+
+def _exec_validator(lines: List[str], namespace: Dict[str, Any], function_name: str, resource_type: str) -> Callable[..., Dict[str, Any]]:
+    """Compile generated validator source and return the function it defines."""
+    source = "\n".join(lines) + "\n"
+    exec(compile(source, f"<{function_name} {resource_type}>", "exec"), namespace)
+    return namespace[function_name]
+
+
+def _compile_create_validator(entries: List[Entry], create_required: List[Entry], resource_type: str, server_id: str) -> CreateValidator:
+    """Generate a straight-line CREATE validator for one resource type.
+    
+    The generated function first rejects unknown fields, then validates each given
+    schema attribute in schema order. Missing required attributes are checked last.
+    """
+    namespace = _validator_namespace(entries, resource_type, server_id)
+    lines = ["def validate_create(validator, data, allow_unknown, check_required):", *_UNKNOWN_FIELD_CHECK]
+    
+    for index, entry in enumerate(entries):
+        lines.append(f"    if {entry.name!r} in data:")
+        _emit_value_checks(lines, namespace, index, entry)
+    
+    # Missing required fields are reported only after every given value has been
+    # validated, checking just the plan's (usually few) CREATE-required entries
+    if create_required:
+        lines.append("    if check_required:")
+        for index, entry in enumerate(create_required):
+            required_ref = f"_r{index}"
+            namespace[required_ref] = entry
+            lines.append(f"        if {entry.name!r} not in out:")
+            lines.append(f"            _raise({required_ref}.required_missing_detail)")
+    lines.append("    return out")
+    return _exec_validator(lines, namespace, "validate_create", resource_type)
+
+
+def _compile_update_validator(entries: List[Entry], resource_type: str, server_id: str) -> UpdateValidator:
+    """Generate a straight-line UPDATE (PUT) validator for one resource type.
+    
+    Like the CREATE validator, but given readOnly attributes are rejected and nothing
+    is required: only the fields in the request are validated and returned.
+    """
+    namespace = _validator_namespace(entries, resource_type, server_id)
+    lines = ["def validate_update(validator, data, allow_unknown):", *_UNKNOWN_FIELD_CHECK]
+    
+    for index, entry in enumerate(entries):
+        lines.append(f"    if {entry.name!r} in data:")
+        if entry.is_readonly:
+            entry_ref = f"_e{index}"
+            namespace[entry_ref] = entry
+            lines.append(f"        _raise({entry_ref}.readonly_modification_detail)")
+        else:
+            _emit_value_checks(lines, namespace, index, entry)
+    lines.append("    return out")
+    return _exec_validator(lines, namespace, "validate_update", resource_type)
+
+
+def _compile_plan(schema: Dict[str, Any], resource_type: str, server_id: str) -> ResourcePlan:
+    """Compile a resource schema into a validation plan."""
+    entries = [_compile_entry(attr, resource_type, server_id) for attr in schema["attributes"]]
+    returned = {"always": [], "default": [], "request": []}
+    for attr in schema["attributes"]:
+        # returned=never (and unknown policies) are never part of a response
+        names = returned.get(attr.get("returned", "default"))
+        if names is not None:
+            names.append(sys.intern(attr["name"]))
+    
+    # readOnly fields are server-assigned, so CREATE never requires them
+    create_required = [entry for entry in entries if entry.required and not entry.is_readonly]
+    
+    return ResourcePlan(
+        attr_by_name={entry.name: entry for entry in entries},
+        create_required=create_required,
+        returned_always=returned["always"],
+        returned_default=returned["default"],
+        returned_request=returned["request"],
+        # Response attributes when the client neither requests nor excludes any
+        returned_by_default=returned["always"] + returned["default"],
+        create_validator=_compile_create_validator(entries, create_required, resource_type, server_id),
+        update_validator=_compile_update_validator(entries, resource_type, server_id)
+    )
+
+
+class _PatchState:
+    """Fields set and removed by the PATCH operations applied so far."""
+    
+    __slots__ = ("resource_type", "existing_data", "to_set", "deleted")
+    
+    def __init__(self, resource_type: str, existing_data: Dict[str, Any]) -> None:
+        self.resource_type: str = resource_type
+        self.existing_data: Dict[str, Any] = existing_data
+        self.to_set: Dict[str, Any] = {}
+        self.deleted: Dict[str, None] = {}  # insertion-ordered set of removed fields
+    
+    def contains(self, attr_name: str) -> bool:
+        """Whether the patched resource currently has the field."""
+        return attr_name in self.to_set or (attr_name in self.existing_data and attr_name not in self.deleted)
+    
+    def current_value(self, attr_name: str, default: Any = None) -> Any:
+        """Value of a field after the operations applied so far."""
+        if attr_name in self.to_set:
+            return self.to_set[attr_name]
+        if attr_name in self.deleted:
+            return default
+        return self.existing_data.get(attr_name, default)
+    
+    def set(self, attr_name: str, value: Any) -> None:
+        self.to_set[attr_name] = value
+        self.deleted.pop(attr_name, None)
+    
+    def remove(self, attr_name: str) -> None:
+        self.to_set.pop(attr_name, None)
+        if attr_name in self.existing_data:
+            self.deleted[attr_name] = None
+
+
+# Shared read-only default for servers without validation rules
+_EMPTY_RULES: Mapping[str, Any] = MappingProxyType({})
+
+# Compiled plans keyed by (server_id, resource_type). Each entry remembers the config
+# object the schema was generated from, so a reloaded or updated config is recompiled.
+_PLAN_CACHE: Dict[Tuple[str, str], Tuple[Dict[str, Any], ResourcePlan]] = {}
+
+
+def invalidate_plans(server_id: str) -> None:
+    """Drop the compiled plans of a server, e.g. after its configuration changed or was evicted."""
+    # Runs on request threads while others insert plans: snapshot the keys in one C-level
+    # call instead of iterating the live dict, and tolerate keys removed concurrently
+    for key in tuple(_PLAN_CACHE):
+        if key[0] == server_id:
+            _PLAN_CACHE.pop(key, None)
+
+
+register_config_change_hook(invalidate_plans)
 
 
 class SchemaValidator:
     """Validates SCIM data against server-specific schemas."""
     
-    def __init__(self, schema_generator: DynamicSchemaGenerator):
-        self.schema_generator = schema_generator
-        self.server_id = schema_generator.server_id
-        self.server_config = get_server_config_manager(schema_generator.db).get_server_config(self.server_id)
-        self.validation_rules = self.server_config.get("validation_rules", {})
+    def __init__(self, schema_generator: DynamicSchemaGenerator) -> None:
+        self.schema_generator: DynamicSchemaGenerator = schema_generator
+        self.server_id: str = schema_generator.server_id
+        # The generator already resolved the (cached) server config for this request
+        self.server_config: Dict[str, Any] = schema_generator.server_config
+        self.validation_rules: Mapping[str, Any] = self.server_config.get("validation_rules", _EMPTY_RULES)
+        # Rules consulted on every request, resolved once per validator
+        self.allow_unknown_attributes: bool = self.validation_rules.get("allow_unknown_attributes", False)
+        self.validate_required_fields: bool = self.validation_rules.get("validate_required_fields", True)
+        # Only compiled plans are kept; schemas are resolved when a plan is first compiled
+        self._plans: Dict[str, ResourcePlan] = {}
+    
+    # Schema getters by resource type
+    _SCHEMA_GETTERS: Dict[str, Callable[[DynamicSchemaGenerator], Dict[str, Any]]] = {
+        "User": DynamicSchemaGenerator.get_user_schema,
+        "Group": DynamicSchemaGenerator.get_group_schema,
+        "Entitlement": DynamicSchemaGenerator.get_entitlement_schema,
+    }
+    
+    def _get_plan(self, resource_type: str) -> ResourcePlan:
+        """Get the compiled validation plan for a resource type."""
+        plan = self._plans.get(resource_type)
+        if plan is not None:
+            return plan
+        
+        config = self.schema_generator.server_config
+        key = (self.server_id, resource_type)
+        cached = _PLAN_CACHE.get(key)
+        if cached is not None and cached[0] is config:
+            plan = cached[1]
+        else:
+            plan = _compile_plan(self.get_schema(resource_type), resource_type, self.server_id)
+            _PLAN_CACHE[key] = (config, plan)
+        
+        self._plans[resource_type] = plan
+        return plan
     
     def get_schema(self, resource_type: str) -> Dict[str, Any]:
         """Get server-specific schema for a resource type."""
-        schema_map = {
-            "User": self.schema_generator.get_user_schema,
-            "Group": self.schema_generator.get_group_schema,
-            "Entitlement": self.schema_generator.get_entitlement_schema
-        }
-        
-        if resource_type in schema_map:
-            return schema_map[resource_type]()
+        getter = self._SCHEMA_GETTERS.get(resource_type)
+        if getter is not None:
+            return getter(self.schema_generator)
         
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "error": "SCIM_VALIDATION_ERROR",
-                "message": f"Unknown resource type '{resource_type}'",
-                "resource_type": resource_type,
-                "server_id": self.server_id,
-                "help": f"Resource type '{resource_type}' is not supported by this server."
-            }
-        )
+        _raise_scim_error("unknown_resource_type", resource_type, self.server_id)
     
     def validate_create_request(self, resource_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validate a CREATE request against the server-specific schema.
         Returns cleaned/validated data.
         """
-        schema = self.get_schema(resource_type)
-        validated_data = {}
-        
-        # Create attribute lookup for quick access
-        attr_lookup = {attr["name"]: attr for attr in schema["attributes"]}
-        
-        # Check if unknown attributes are allowed
-        allow_unknown = self.validation_rules.get("allow_unknown_attributes", False)
-        
-        for field_name, field_value in data.items():
-            if field_name in attr_lookup:
-                attr = attr_lookup[field_name]
-                validated_value = self._validate_attribute(attr, field_value, resource_type)
-                validated_data[field_name] = validated_value
-            elif not allow_unknown:
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "error": "SCIM_VALIDATION_ERROR",
-                        "message": f"Unknown field '{field_name}'",
-                        "field": field_name,
-                        "resource_type": resource_type,
-                        "server_id": self.server_id,
-                        "type": "unknown_field",
-                        "help": f"The field '{field_name}' does not exist in the {resource_type} schema for this server."
-                    }
-                )
-            # If allow_unknown is True, skip unknown fields
+        plan = self._get_plan(resource_type)
         
-        # Validate required fields
-        if self.validation_rules.get("validate_required_fields", True):
-            self._validate_required_fields(schema, validated_data, resource_type, "create")
-        
-        return validated_data
+        # Unknown fields are skipped when allowed
+        return plan.create_validator(
+            self,
+            data,
+            self.allow_unknown_attributes,
+            self.validate_required_fields
+        )
     
     def validate_update_request(self, resource_type: str, data: Dict[str, Any], existing_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validate an UPDATE request against the server-specific schema.
         Returns cleaned/validated data after merging with existing data.
         """
-        schema = self.get_schema(resource_type)
-        validated_data = existing_data.copy()
-        
-        # Create attribute lookup for quick access
-        attr_lookup = {attr["name"]: attr for attr in schema["attributes"]}
-        
-        # Check if unknown attributes are allowed
-        allow_unknown = self.validation_rules.get("allow_unknown_attributes", False)
-        
-        for field_name, field_value in data.items():
-            if field_name in attr_lookup:
-                attr = attr_lookup[field_name]
-                if attr.get("mutability") != "readOnly":
-                    validated_value = self._validate_attribute(attr, field_value, resource_type)
-                    validated_data[field_name] = validated_value
-                else:
-                    raise HTTPException(
-                        status_code=400,
-                        detail={
-                            "error": "SCIM_VALIDATION_ERROR",
-                            "message": f"Cannot modify readOnly field '{field_name}'",
-                            "field": field_name,
-                            "resource_type": resource_type,
-                            "server_id": self.server_id,
-                            "type": "readonly_field_modification",
-                            "help": f"The field '{field_name}' is read-only and cannot be modified."
-                        }
-                    )
-            elif not allow_unknown:
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "error": "SCIM_VALIDATION_ERROR",
-                        "message": f"Unknown field '{field_name}'",
-                        "field": field_name,
-                        "resource_type": resource_type,
-                        "server_id": self.server_id,
-                        "type": "unknown_field",
-                        "help": f"The field '{field_name}' does not exist in the {resource_type} schema for this server."
-                    }
-                )
-        
-        return validated_data
+        return {**existing_data, **self.validate_update_request_diff(resource_type, data)}
+    
+    def validate_update_request_diff(self, resource_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate an UPDATE request against the server-specific schema.
+        Returns only the validated fields from the request, without copying the existing
+        resource; the caller merges them (the CRUD update methods only touch given fields).
+        """
+        plan = self._get_plan(resource_type)
+        return plan.update_validator(self, data, self.allow_unknown_attributes)
     
     def validate_patch_request(self, resource_type: str, operations: List[Dict[str, Any]], existing_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validate a PATCH request against the server-specific schema.
         Returns cleaned/validated data after applying patches.
         """
-        schema = self.get_schema(resource_type)
-        validated_data = existing_data.copy()
-        
-        # Create attribute lookup for quick access
-        attr_lookup = {attr["name"]: attr for attr in schema["attributes"]}
+        to_set, to_delete = self.validate_patch_request_diff(resource_type, operations, existing_data)
+        validated_data = {**existing_data, **to_set}
+        for attr_name in to_delete:
+            validated_data.pop(attr_name, None)
+        return validated_data
+    
+    def validate_patch_request_diff(self, resource_type: str, operations: List[Dict[str, Any]], existing_data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Validate a PATCH request against the server-specific schema.
+        Returns (fields_to_set, fields_to_delete) instead of a patched copy of the
+        resource; existing_data is only read, never modified.
+        """
+        plan = self._get_plan(resource_type)
+        state = _PatchState(resource_type, existing_data)
+        patch_ops = self._PATCH_OPS
         
+        # Parse every operation once up front into (handler, entry, attribute name, value),
+        # resolving the attribute's compiled entry here so handlers need no further lookups.
+        # Operation names are case-insensitive (RFC 7644 §3.5.2), so "Replace" is accepted.
+        parsed = []
         for operation in operations:
             op = operation.get("op", "replace")
-            path = operation.get("path")
-            value = operation.get("value")
+            op_spec = patch_ops.get(op.lower()) if type(op) is str else None
+            if op_spec is None:
+                _raise_scim_error("invalid_operation", resource_type, self.server_id, operation=op)
             
-            if op == "replace":
-                if path:
-                    # Single attribute replacement
-                    attr_name = path.lstrip("/")
-                    if attr_name in attr_lookup:
-                        attr = attr_lookup[attr_name]
-                        if attr.get("mutability") != "readOnly":
-                            validated_value = self._validate_attribute(attr, value, resource_type)
-                            validated_data[attr_name] = validated_value
-                        else:
-                            raise HTTPException(
-                                status_code=400,
-                                detail={
-                                    "error": "SCIM_VALIDATION_ERROR",
-                                    "message": f"Cannot modify readOnly field '{attr_name}'",
-                                    "field": attr_name,
-                                    "operation": "PATCH",
-                                    "resource_type": resource_type,
-                                    "server_id": self.server_id,
-                                    "type": "readonly_field_modification",
-                                    "help": f"The field '{attr_name}' is read-only and cannot be modified. Remove this field from your request."
-                                }
-                            )
-                    else:
-                        # Check if unknown attributes are allowed
-                        allow_unknown = self.validation_rules.get("allow_unknown_attributes", False)
-                        if not allow_unknown:
-                            raise HTTPException(
-                                status_code=400,
-                                detail={
-                                    "error": "SCIM_VALIDATION_ERROR",
-                                    "message": f"Unknown field '{attr_name}'",
-                                    "field": attr_name,
-                                    "operation": "PATCH",
-                                    "resource_type": resource_type,
-                                    "server_id": self.server_id,
-                                    "type": "unknown_field",
-                                    "help": f"The field '{attr_name}' does not exist in the {resource_type} schema for this server. Check the schema definition for valid fields."
-                                }
-                            )
-                else:
-                    # Full resource replacement
-                    for attr_name, attr_value in value.items():
-                        if attr_name in attr_lookup:
-                            attr = attr_lookup[attr_name]
-                            if attr.get("mutability") != "readOnly":
-                                validated_value = self._validate_attribute(attr, attr_value, resource_type)
-                                validated_data[attr_name] = validated_value
-                            # Skip readOnly fields silently in full replacement
-            
-            elif op == "add":
-                # Add operation for multi-valued attributes
-                if path:
-                    attr_name = path.lstrip("/")
-                    if attr_name in attr_lookup:
-                        attr = attr_lookup[attr_name]
-                        if attr.get("multiValued", False):
-                            existing_values = validated_data.get(attr_name, [])
-                            if not isinstance(existing_values, list):
-                                existing_values = []
-                            validated_value = self._validate_attribute(attr, value, resource_type)
-                            if isinstance(validated_value, list):
-                                existing_values.extend(validated_value)
-                            else:
-                                existing_values.append(validated_value)
-                            validated_data[attr_name] = existing_values
-                        else:
-                            raise HTTPException(
-                                status_code=400,
-                                detail={
-                                    "error": "SCIM_VALIDATION_ERROR",
-                                    "message": f"Cannot use 'add' operation on single-valued field '{attr_name}'",
-                                    "field": attr_name,
-                                    "operation": "add",
-                                    "resource_type": resource_type,
-                                    "server_id": self.server_id,
-                                    "type": "invalid_operation_for_field_type",
-                                    "help": f"The field '{attr_name}' is single-valued. Use 'replace' operation instead of 'add'."
-                                }
-                            )
-                    else:
-                        # Check if unknown attributes are allowed
-                        allow_unknown = self.validation_rules.get("allow_unknown_attributes", False)
-                        if not allow_unknown:
-                            raise HTTPException(
-                                status_code=400,
-                                detail={
-                                    "error": "SCIM_VALIDATION_ERROR",
-                                    "message": f"Unknown field '{attr_name}'",
-                                    "field": attr_name,
-                                    "operation": "add",
-                                    "resource_type": resource_type,
-                                    "server_id": self.server_id,
-                                    "type": "unknown_field",
-                                    "help": f"The field '{attr_name}' does not exist in the {resource_type} schema for this server."
-                                }
-                            )
-            
-            elif op == "remove":
-                # Remove operation
-                if path:
-                    attr_name = path.lstrip("/")
-                    if attr_name in validated_data:
-                        if attr_lookup.get(attr_name, {}).get("multiValued", False):
-                            # Remove from multi-valued attribute
-                            existing_values = validated_data[attr_name]
-                            if isinstance(existing_values, list):
-                                # Remove specific value if provided
-                                if value in existing_values:
-                                    existing_values.remove(value)
-                                validated_data[attr_name] = existing_values
-                        else:
-                            # Remove single-valued attribute
-                            validated_data.pop(attr_name, None)
-                    else:
-                        # Check if unknown attributes are allowed
-                        allow_unknown = self.validation_rules.get("allow_unknown_attributes", False)
-                        if not allow_unknown:
-                            raise HTTPException(
-                                status_code=400,
-                                detail={
-                                    "error": "SCIM_VALIDATION_ERROR",
-                                    "message": f"Unknown field '{attr_name}'",
-                                    "field": attr_name,
-                                    "operation": "remove",
-                                    "resource_type": resource_type,
-                                    "server_id": self.server_id,
-                                    "type": "unknown_field",
-                                    "help": f"The field '{attr_name}' does not exist in the {resource_type} schema for this server."
-                                }
-                            )
+            handler, error_operation = op_spec
+            # No path means the whole resource; a path of only slashes strips to "" and is
+            # rejected below as an unknown field, never treated as a full replacement
+            path = operation.get("path")
+            attr_name = path.lstrip("/") if path else None
+            entry = plan.attr_by_name.get(attr_name) if attr_name is not None else None
+            # 'remove' checks the field against the resource itself, not the schema
+            if entry is None and attr_name is not None and error_operation is not None:
+                self._check_unknown_patch_field(attr_name, error_operation, resource_type)
+            parsed.append((handler, entry, attr_name, operation.get("value")))
         
-        return validated_data
+        for handler, entry, attr_name, value in parsed:
+            handler(self, plan, entry, attr_name, value, state)
+        
+        return state.to_set, list(state.deleted)
     
-    def _validate_required_fields(self, schema: Dict[str, Any], data: Dict[str, Any], resource_type: str, operation: str = "create") -> None:
-        """Validate that all required fields are present."""
-        for attr in schema["attributes"]:
-            if attr.get("required", False):
-                attr_name = attr["name"]
-                mutability = attr.get("mutability", "readWrite")
-                
-                # Skip read-only fields for CREATE operations
-                if operation == "create" and mutability == "readOnly":
-                    continue
-                
-                if attr_name not in data:
-                    raise HTTPException(
-                        status_code=400,
-                        detail={
-                            "error": "SCIM_VALIDATION_ERROR",
-                            "message": f"Required field '{attr_name}' is missing",
-                            "field": attr_name,
-                            "resource_type": resource_type,
-                            "server_id": self.server_id,
-                            "type": "required_field_missing",
-                            "help": f"Add the '{attr_name}' field to your request. This field is required."
-                        }
-                    )
-    
-    def _validate_single_value(self, attr: Dict[str, Any], value: Any, resource_type: str = "Unknown") -> Any:
-        """Validate a single value against an attribute definition."""
-        attr_name = attr["name"]
-        attr_type = attr["type"]
-        attr_canonical_values = attr.get("canonicalValues", [])
-        attr_required = attr.get("required", False)
+    def _check_unknown_patch_field(self, attr_name: str, operation: str, resource_type: str) -> None:
+        """Reject a PATCH path naming a field outside the schema, unless unknown fields are allowed."""
+        if self.allow_unknown_attributes:
+            return
         
-        # Handle None values for optional fields
-        if value is None:
-            if attr_required:
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "error": "SCIM_VALIDATION_ERROR",
-                        "message": f"Required field '{attr_name}' cannot be null",
-                        "field": attr_name,
-                        "provided_value": None,
-                        "resource_type": resource_type,
-                        "server_id": self.server_id,
-                        "type": "required_field_missing",
-                        "help": f"Add a value for '{attr_name}'. This field is required."
-                    }
-                )
-            else:
-                # Optional field can be None
-                return None
+        template_name = "unknown_patch_field" if operation == "PATCH" else "unknown_field"
+        _raise_scim_error(template_name, resource_type, self.server_id, field=attr_name, operation=operation)
+    
+    def _patch_replace(self, plan: ResourcePlan, entry: Optional[Entry], attr_name: Optional[str], value: Any, state: "_PatchState") -> None:
+        """Apply a PATCH 'replace' operation."""
+        if attr_name is None:
+            # Full resource replacement
+            for attr_name, attr_value in value.items():
+                entry = plan.attr_by_name.get(attr_name)
+                # Skip unknown and readOnly fields silently in full replacement
+                if entry is not None and not entry.is_readonly:
+                    state.set(attr_name, self._validate_attribute(entry, attr_value, state.resource_type))
+            return
         
-        # Type validation
-        if attr_type == "string":
-            if not isinstance(value, str):
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "error": "SCIM_VALIDATION_ERROR",
-                        "message": f"Field '{attr_name}' must be a string",
-                        "field": attr_name,
-                        "provided_value": value,
-                        "expected_type": "string",
-                        "resource_type": resource_type,
-                        "server_id": self.server_id,
-                        "type": "type_mismatch",
-                        "help": f"Change the value of '{attr_name}' to a string."
-                    }
-                )
-        elif attr_type == "boolean":
-            if not isinstance(value, bool):
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "error": "SCIM_VALIDATION_ERROR",
-                        "message": f"Field '{attr_name}' must be a boolean",
-                        "field": attr_name,
-                        "provided_value": value,
-                        "expected_type": "boolean",
-                        "resource_type": resource_type,
-                        "server_id": self.server_id,
-                        "type": "type_mismatch",
-                        "help": f"Change the value of '{attr_name}' to true or false."
-                    }
-                )
-        elif attr_type == "complex":
-            if not isinstance(value, dict):
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "error": "SCIM_VALIDATION_ERROR",
-                        "message": f"Field '{attr_name}' must be an object",
-                        "field": attr_name,
-                        "provided_value": value,
-                        "expected_type": "object",
-                        "resource_type": resource_type,
-                        "server_id": self.server_id,
-                        "type": "type_mismatch",
-                        "help": f"Change the value of '{attr_name}' to an object with the required sub-attributes."
-                    }
-                )
-            
-            # Validate complex attribute sub-attributes
-            sub_attrs = attr.get("subAttributes", [])
-            validated_complex = {}
-            
-            for sub_attr in sub_attrs:
-                sub_attr_name = sub_attr["name"]
-                sub_attr_required = sub_attr.get("required", False)
-                
-                if sub_attr_name in value:
-                    validated_sub_value = self._validate_single_value(sub_attr, value[sub_attr_name], resource_type)
-                    validated_complex[sub_attr_name] = validated_sub_value
-                elif sub_attr_required:
-                    raise HTTPException(
-                        status_code=400,
-                        detail={
-                            "error": "SCIM_VALIDATION_ERROR",
-                            "message": f"Required sub-attribute '{sub_attr_name}' is missing in '{attr_name}'",
-                            "field": f"{attr_name}.{sub_attr_name}",
-                            "resource_type": resource_type,
-                            "server_id": self.server_id,
-                            "type": "required_field_missing",
-                            "help": f"Add the '{sub_attr_name}' field to '{attr_name}'. This field is required."
-                        }
-                    )
-            
-            return validated_complex
+        # Single attribute replacement; unknown fields were rejected while parsing
+        if entry is None:
+            return
         
-        # Canonical values validation
-        if attr_canonical_values and value not in attr_canonical_values:
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "error": "SCIM_VALIDATION_ERROR",
-                    "message": f"Field '{attr_name}' value '{value}' is not valid",
-                    "field": attr_name,
-                    "provided_value": value,
-                    "allowed_values": attr_canonical_values,
-                    "resource_type": resource_type,
-                    "server_id": self.server_id,
-                    "type": "invalid_canonical_value",
-                    "help": f"Use one of the allowed values: {', '.join(attr_canonical_values)}"
-                }
-            )
+        if entry.is_readonly:
+            _raise_validation_error(entry.patch_readonly_detail)
         
-        return value
+        state.set(attr_name, self._validate_attribute(entry, value, state.resource_type))
     
-    def _validate_attribute(self, attr: Dict[str, Any], value: Any, resource_type: str = "Unknown") -> Any:
-        """Validate an attribute value against its definition."""
-        attr_multi_valued = attr.get("multiValued", False)
+    def _patch_add(self, plan: ResourcePlan, entry: Optional[Entry], attr_name: Optional[str], value: Any, state: "_PatchState") -> None:
+        """Apply a PATCH 'add' operation (multi-valued attributes only)."""
+        # Unknown fields were rejected while parsing
+        if entry is None:
+            return
+        
+        if not entry.multi:
+            _raise_validation_error(entry.add_single_valued_detail)
+        
+        # Copy so the caller's existing_data is never modified
+        existing_values = state.current_value(attr_name, [])
+        existing_values = list(existing_values) if type(existing_values) is list else []
+        validated_value = self._validate_attribute(entry, value, state.resource_type)
+        if type(validated_value) is list:
+            existing_values.extend(validated_value)
+        else:
+            existing_values.append(validated_value)
+        state.set(attr_name, existing_values)
+    
+    def _patch_remove(self, plan: ResourcePlan, entry: Optional[Entry], attr_name: Optional[str], value: Any, state: "_PatchState") -> None:
+        """Apply a PATCH 'remove' operation."""
+        if attr_name is None:
+            return
+        
+        if not state.contains(attr_name):
+            self._check_unknown_patch_field(attr_name, "remove", state.resource_type)
+            return
         
-        if attr_multi_valued:
-            if not isinstance(value, list):
-                value = [value]
-            validated_values = []
-            for item in value:
-                validated_item = self._validate_single_value(attr, item, resource_type)
-                validated_values.append(validated_item)
-            return validated_values
+        if entry is not None and entry.multi:
+            # Remove a specific value from a multi-valued attribute
+            existing_values = state.current_value(attr_name)
+            if type(existing_values) is list:
+                if type(value) is list:
+                    # Bulk removal (e.g. membership sync) in one pass over the existing values
+                    try:
+                        removed = set(value)
+                        existing_values = [item for item in existing_values if item not in removed]
+                    except TypeError:
+                        # Complex values are unhashable dicts
+                        existing_values = [item for item in existing_values if item not in value]
+                else:
+                    existing_values = list(existing_values)
+                    try:
+                        existing_values.remove(value)
+                    except ValueError:
+                        pass  # Removing a value that is not present is a no-op
+                state.set(attr_name, existing_values)
         else:
-            return self._validate_single_value(attr, value, resource_type)
+            # Remove single-valued attribute
+            state.remove(attr_name)
+    
+    # PATCH handlers by (lower-case) operation, with the operation name reported for
+    # unknown fields found while parsing (None: the handler checks the field itself)
+    _PATCH_OPS = {
+        "replace": (_patch_replace, "PATCH"),
+        "add": (_patch_add, "add"),
+        "remove": (_patch_remove, None),
+    }
+    
+    def _validate_attribute(self, entry: Entry, value: Any, resource_type: str = "Unknown") -> Any:
+        """Validate an attribute value against its compiled entry."""
+        return entry.validate(self, value, resource_type)
     
-    def filter_response_data(self, resource_type: str, data: Dict[str, Any], requested_attributes: Optional[List[str]] = None, excluded_attributes: Optional[List[str]] = None) -> Dict[str, Any]:
+    def filter_response_data(self, resource_type: str, data: Dict[str, Any], requested_attributes: Optional[Iterable[str]] = None, excluded_attributes: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """
         Filter response data based on server-specific schema and requested/excluded attributes.
         """
-        schema = self.get_schema(resource_type)
+        plan = self._get_plan(resource_type)
+        if not requested_attributes and not excluded_attributes:
+            return {attr_name: data[attr_name] for attr_name in plan.returned_by_default if attr_name in data}
+        
         filtered_data = {}
+        requested = frozenset(requested_attributes) if requested_attributes else None
+        excluded = frozenset(excluded_attributes) if excluded_attributes else None
         
-        for attr in schema["attributes"]:
-            attr_name = attr["name"]
-            attr_returned = attr.get("returned", "default")
-            
-            # Skip if attribute is not in data
-            if attr_name not in data:
-                continue
-            
-            # Handle requested attributes
-            if requested_attributes and attr_name not in requested_attributes:
-                continue
-            
-            # Handle excluded attributes
-            if excluded_attributes and attr_name in excluded_attributes:
-                continue
-            
-            # Handle returned policy
-            if attr_returned == "never":
-                continue
-            elif attr_returned == "always":
-                filtered_data[attr_name] = data[attr_name]
-            elif attr_returned == "default":
-                # Include by default unless explicitly excluded
-                if not excluded_attributes or attr_name not in excluded_attributes:
-                    filtered_data[attr_name] = data[attr_name]
-            elif attr_returned == "request":
-                # Only include if explicitly requested
-                if requested_attributes and attr_name in requested_attributes:
+        # returned=never attributes are not part of the plan; returned=request ones are
+        # only considered when attributes were explicitly requested
+        attribute_groups = [plan.returned_always, plan.returned_default]
+        if requested is not None:
+            attribute_groups.append(plan.returned_request)
+        
+        for attr_names in attribute_groups:
+            for attr_name in attr_names:
+                if (attr_name in data
+                        and (requested is None or attr_name in requested)
+                        and (excluded is None or attr_name not in excluded)):
                     filtered_data[attr_name] = data[attr_name]
         
         return filtered_data
 
 
-def create_schema_validator(db_session, server_id: str) -> SchemaValidator:
+def create_schema_validator(db_session: Session, server_id: str) -> SchemaValidator:
     """Factory function to create a server-specific schema validator."""
-    schema_generator = DynamicSchemaGenerator(db_session, server_id)
+    schema_generator = DynamicSchemaGenerator.for_server(db_session, server_id)
     return SchemaValidator(schema_generator) 
\ No newline at end of file
@@ -1,46 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+import hashlib
+from types import MappingProxyType
+
+from fastapi import Depends, Header, HTTPException, Path, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from loguru import logger
 from typing import List, Dict, Any, Callable
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
-from .database import get_db
-from .auth import get_api_key, get_validated_server_id
-# Removed ApiKey import - no longer needed
 from .config import settings
-from .schema_definitions import DynamicSchemaGenerator
+from .database import get_db_factory
+from .auth import get_api_key, validate_server_id
+# Removed ApiKey import - no longer needed
+from .local_bucket import check_discovery_rate_limit
+from .schema_definitions import DynamicSchemaGenerator, dump_json
+from .server_config import get_cached_server_config, get_server_config_manager, is_password_support_enabled_in
 from .server_context import get_server_id_from_path
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+SCIM_MEDIA_TYPE = "application/scim+json"
 
-# Construct the API prefix dynamically
-api_prefix = f"{settings.api_base_path}/scim/v2"
-router = APIRouter(prefix=api_prefix, tags=["SCIM"])
 
-@router.get("/ServiceProviderConfig")
-@router.get("/ServiceProviderConfig/")  # With trailing slash
-@limiter.limit(f"{settings.rate_limit_read}/{settings.rate_limit_window}minute")
-async def get_service_provider_config(
-    request: Request,
-    server_id: str = Depends(get_validated_server_id),
-    api_key: str = Depends(get_api_key),
-    db: Session = Depends(get_db)
-):
-    """
-    Get Service Provider Configuration per RFC 7644 §4.4.
-    This endpoint is used to discover the capabilities supported by a SCIM service provider.
+# Strong ETags of served discovery bodies. The bodies are cached bytes objects that are
+# reused across requests, so the lookup hashes nothing new; bounded so superseded
+# payloads (after config changes) do not accumulate.
+_ETAGS: Dict[bytes, str] = {}
+_ETAGS_MAX = 256
+
+
+def _etag_for(content: bytes) -> str:
+    """Return the quoted strong ETag for a response body."""
+    etag = _ETAGS.get(content)
+    if etag is None:
+        if len(_ETAGS) >= _ETAGS_MAX:
+            _ETAGS.clear()
+        etag = _ETAGS[content] = f'"{hashlib.blake2b(content, digest_size=8).hexdigest()}"'
+    return etag
+
+
+# Discovery responses are per server and require authentication, so only the client
+# (not shared proxies) may cache them; revalidation goes through the ETag
+_DISCOVERY_CACHE_CONTROL = f"private, max-age={settings.discovery_cache_max_age}"
+
+
+def _discovery_response(request: Request, content: bytes) -> Response:
+    """Return the body with its ETag, or an empty 304 when If-None-Match already matches."""
+    etag = _etag_for(content)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": _DISCOVERY_CACHE_CONTROL})
+    return Response(
+        content=content,
+        media_type=SCIM_MEDIA_TYPE,
+        headers={"ETag": etag, "Cache-Control": _DISCOVERY_CACHE_CONTROL}
+    )
+
+
+async def _ensure_server_config(db_factory: Callable[[], Session], server_id: str) -> Dict[str, Any]:
     """
-    logger.info(f"ServiceProviderConfig endpoint called for server: {server_id}")
+    Return the server's config without running a blocking query on the event loop.
     
-    # Check if password support is enabled for this server
-    from .server_config import get_server_config_manager
-    server_config = get_server_config_manager(db)
-    password_supported = server_config.is_password_support_enabled(server_id)
+    Discovery handlers are async, so a config (re)load would run its blocking query on
+    the event loop; on a cache miss the load is moved to the threadpool instead, and only
+    then is a session opened. Handlers must use the returned config rather than looking
+    it up again, since the cached entry may expire in between.
+    """
+    server_config = get_cached_server_config(server_id)
+    if server_config is None:
+        config_manager = get_server_config_manager(db_factory())
+        server_config = await run_in_threadpool(config_manager.get_server_config, server_id)
+    return server_config
+
+
+async def discovery_server_id(
+    request: Request,
+    server_id: str = Path(..., description="Server identifier"),
+    authorization: str = Header(None)
+) -> str:
+    """
+    Single dependency for discovery endpoints: validate the server ID, authenticate and
+    apply the discovery rate limit, in that order.
     
-    # Return RFC 7644 §4.4 compliant ServiceProviderConfig response
-    response = {
+    Equivalent to depending on get_validated_server_id, get_api_key and
+    check_discovery_rate_limit separately, but FastAPI only has one flat dependency to
+    solve per request instead of four (one of them nested).
+    """
+    server_id = validate_server_id(server_id)
+    await get_api_key(authorization)
+    await check_discovery_rate_limit(request)
+    return server_id
+
+
+def _service_provider_config(password_supported: bool) -> Dict[str, Any]:
+    """Build the RFC 7644 §4.4 ServiceProviderConfig response."""
+    return {
         "schemas": ["urn:ietf:params:scim:schemas:core:2.0:ServiceProviderConfig"],
         "patch": {"supported": True},
         "bulk": {"supported": False, "maxOperations": 0},
@@ -56,91 +110,94 @@ async def get_service_provider_config(
             }
         ]
     }
+
+
+# The response only varies with password support, so both variants are serialized once
+_SERVICE_PROVIDER_CONFIG_BYTES = MappingProxyType({
+    supported: dump_json(_service_provider_config(supported)) for supported in (True, False)
+})
+
+
+# Discovery handlers; they are registered on the path-based SCIM router by
+# create_path_based_routers, which is the only place they are routed from.
+
+async def get_service_provider_config(
+    request: Request,
+    server_id: str = Depends(discovery_server_id),
+    db_factory: Callable[[], Session] = Depends(get_db_factory)
+):
+    """
+    Get Service Provider Configuration per RFC 7644 §4.4.
+    This endpoint is used to discover the capabilities supported by a SCIM service provider.
+    """
+    logger.debug("ServiceProviderConfig endpoint called for server: {}", server_id)
     
-    logger.info(f"Returning ServiceProviderConfig for server: {server_id} (password support: {password_supported})")
-    return response
+    # Check if password support is enabled for this server
+    server_config = await _ensure_server_config(db_factory, server_id)
+    password_supported = is_password_support_enabled_in(server_config)
+    
+    logger.info("Returning ServiceProviderConfig for server: {} (password support: {})", server_id, password_supported)
+    return _discovery_response(request, _SERVICE_PROVIDER_CONFIG_BYTES[password_supported])
 
-@router.get("/ResourceTypes")
-@router.get("/ResourceTypes/")  # With trailing slash
-@limiter.limit(f"{settings.rate_limit_read}/{settings.rate_limit_window}minute")
 async def get_resource_types(
     request: Request,
-    server_id: str = Depends(get_validated_server_id),
-    api_key: str = Depends(get_api_key),
-    db: Session = Depends(get_db)
+    server_id: str = Depends(discovery_server_id),
+    db_factory: Callable[[], Session] = Depends(get_db_factory)
 ):
     """
     Get available resource types for SCIM schema discovery.
     This endpoint is called by Okta to discover available resource types.
     """
-    logger.info(f"ResourceTypes endpoint called for server: {server_id}")
-    
-    # Generate resource types dynamically based on server configuration
-    schema_generator = DynamicSchemaGenerator(db, server_id)
-    resource_types = schema_generator.get_resource_types()
+    logger.debug("ResourceTypes endpoint called for server: {}", server_id)
     
-    response = {
-        "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
-        "totalResults": len(resource_types),
-        "startIndex": 1,
-        "itemsPerPage": len(resource_types),
-        "Resources": resource_types
-    }
+    # The response only depends on which resource types the server enables, so it is
+    # serialized once per combination and shared
+    server_config = await _ensure_server_config(db_factory, server_id)
+    schema_generator = DynamicSchemaGenerator.for_config(server_id, server_config)
+    content = schema_generator.get_resource_types_response_bytes()
     
-    logger.info(f"Returning {len(resource_types)} resource types for server: {server_id}")
-    return response
+    logger.info("Returning resource types for server: {}", server_id)
+    return _discovery_response(request, content)
 
-@router.get("/Schemas")
-@router.get("/Schemas/")  # With trailing slash
-@limiter.limit(f"{settings.rate_limit_read}/{settings.rate_limit_window}minute")
 async def get_schemas(
     request: Request,
-    server_id: str = Depends(get_validated_server_id),
-    api_key: str = Depends(get_api_key),
-    db: Session = Depends(get_db)
+    server_id: str = Depends(discovery_server_id),
+    db_factory: Callable[[], Session] = Depends(get_db_factory)
 ):
     """
     Get available schemas for custom extensions.
     This endpoint returns all available schemas for the server.
     """
-    logger.info(f"Schemas endpoint called for server: {server_id}")
+    logger.debug("Schemas endpoint called for server: {}", server_id)
     
-    # Generate schemas dynamically based on server configuration
-    schema_generator = DynamicSchemaGenerator(db, server_id)
-    schemas = schema_generator.get_all_schemas()
-    
-    response = {
-        "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
-        "totalResults": len(schemas),
-        "startIndex": 1,
-        "itemsPerPage": len(schemas),
-        "Resources": schemas
-    }
+    # Generate schemas dynamically based on server configuration; the whole ListResponse
+    # is serialized once per config and reused until the config changes
+    server_config = await _ensure_server_config(db_factory, server_id)
+    schema_generator = DynamicSchemaGenerator.for_config(server_id, server_config)
+    content = schema_generator.get_schemas_response_bytes()
     
-    logger.info(f"Returning {len(schemas)} schemas for server: {server_id}")
-    return response
+    logger.info("Returning schemas for server: {}", server_id)
+    return _discovery_response(request, content)
 
-@router.get("/Schemas/{schema_urn}")
-@limiter.limit(f"{settings.rate_limit_read}/{settings.rate_limit_window}minute")
 async def get_schema_by_urn(
     schema_urn: str,
     request: Request,
-    server_id: str = Depends(get_validated_server_id),
-    api_key: str = Depends(get_api_key),
-    db: Session = Depends(get_db)
+    server_id: str = Depends(discovery_server_id),
+    db_factory: Callable[[], Session] = Depends(get_db_factory)
 ):
     """
     Get a specific schema by URN.
     This endpoint returns a specific schema for the server.
     """
-    logger.info(f"Schema endpoint called for URN: {schema_urn}, server: {server_id}")
+    logger.debug("Schema endpoint called for URN: {}, server: {}", schema_urn, server_id)
     
     # Generate schema dynamically based on server configuration
-    schema_generator = DynamicSchemaGenerator(db, server_id)
-    schema = schema_generator.get_schema_by_urn(schema_urn)
+    server_config = await _ensure_server_config(db_factory, server_id)
+    schema_generator = DynamicSchemaGenerator.for_config(server_id, server_config)
+    schema = schema_generator.get_schema_bytes_by_urn(schema_urn)
     
     if not schema:
         raise HTTPException(status_code=404, detail=f"Schema not found: {schema_urn}")
     
-    logger.info(f"Returning schema for URN: {schema_urn}, server: {server_id}")
-    return schema 
\ No newline at end of file
+    logger.info("Returning schema for URN: {}, server: {}", schema_urn, server_id)
+    return _discovery_response(request, schema) 
\ No newline at end of file
@@ -6,66 +6,350 @@ to have unique attributes, schemas, and configurations. All functions will be dy
 based on the current server ID configuration.
 """
 
-from typing import Dict, Any, List, Optional, Set, Tuple
+from typing import Dict, Any, Iterable, List, Mapping, Optional, Set, Tuple, Callable
+from sqlalchemy import func, insert, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from loguru import logger
-import json
+import orjson
+import threading
 import time
+from collections import OrderedDict
+from types import MappingProxyType
+from functools import lru_cache
+from itertools import chain
 from .models import Schema
 from .config import settings
-# Import app profiles only when needed to avoid circular imports
-# from .app_profiles import get_app_profile_manager, AppType
+# app_profiles does not import this module, so it is resolved once here instead of per call
+try:
+    from .app_profiles import get_app_profile_manager as _get_app_profile_manager, AppType as _AppType
+except ImportError:
+    _get_app_profile_manager = None
+    _AppType = None
+
+
+# Dialects whose insert() supports ON CONFLICT DO UPDATE, used to save configs in one statement
+_UPSERT_INSERTS: Dict[str, Callable[..., Any]] = {
+    "sqlite": sqlite_insert,
+    "postgresql": postgresql_insert,
+}
+
+
+@lru_cache(maxsize=2048)
+def _config_urn(server_id: str) -> str:
+    """URN of the Schema row holding a server's config (bounded memo of the format)."""
+    return f"urn:scim:server:{server_id}:config"
+
+
+def _dump_config(config: Dict[str, Any]) -> str:
+    """Serialize a config for the schema_definition column (orjson emits bytes)."""
+    return orjson.dumps(config).decode("utf-8")
+
+
+def _deep_merge(base: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
+    """Return base with updates merged in, recursing where both sides hold a dict."""
+    result = {**base}
+    for key, value in updates.items():
+        current = result.get(key)
+        if type(current) is dict and type(value) is dict:
+            result[key] = _deep_merge(current, value)
+        else:
+            result[key] = value
+    return result
+
+
+def strip_derived_keys(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Return config without derived (underscore-prefixed) keys, e.g. for storage or display."""
+    return {key: value for key, value in config.items() if not key.startswith("_")}
+
+
+# Callbacks run with a server ID whenever that server's configuration is saved or
+# evicted from the config cache, so modules caching data derived from it drop their
+# entries right away and stay bounded by the config cache's size
+_config_change_hooks: List[Callable[[str], None]] = []
+
+
+def register_config_change_hook(hook: Callable[[str], None]) -> None:
+    """Register a callback invoked with the server ID after its configuration is saved or evicted."""
+    _config_change_hooks.append(hook)
+
+
+def _precompute_schema_views(config: Dict[str, Any]) -> None:
+    """Store normalized attribute views used by schema generation and attribute lookups.
+    
+    The views live under derived keys, so they are never persisted and are rebuilt
+    whenever a configuration is loaded.
+    """
+    for prefix, default_required, default_optional in (
+        ("user", ("userName",), ("displayName", "emails", "name", "active")),
+        ("group", ("displayName",), ("description",)),
+    ):
+        attrs = config.get(f"{prefix}_attributes", {})
+        required_attrs = tuple(attrs.get("required_attributes", default_required))
+        config[f"_{prefix}_required_attrs"] = required_attrs
+        config[f"_{prefix}_required_set"] = frozenset(required_attrs)
+        config[f"_{prefix}_optional_attrs"] = tuple(attrs.get("optional_attributes", default_optional))
+        config[f"_{prefix}_complex_attrs"] = tuple(attrs.get("complex_attributes", {}).items())
+    
+    # Attribute names is_attribute_enabled accepts, and the attribute definitions
+    # get_server_attribute_config returns, per resource type
+    enabled_index = {}
+    attr_index = {}
+    for prefix, resource_type in (("user", "User"), ("group", "Group")):
+        attrs = config.get(f"{prefix}_attributes", {})
+        custom_attrs = attrs.get("custom_attributes", {})
+        complex_attrs = attrs.get("complex_attributes", {})
+        enabled_index[resource_type] = frozenset(chain(
+            attrs.get("required_attributes", ()),
+            attrs.get("optional_attributes", ()),
+            custom_attrs,
+            complex_attrs,
+        ))
+        # Custom attribute definitions take precedence over complex ones
+        attr_index[resource_type] = {**complex_attrs, **custom_attrs}
+    entitlements_by_name = {}
+    for entitlement in config.get("entitlement_types", ()):
+        # The first entitlement type with a given name wins
+        entitlements_by_name.setdefault(entitlement.get("name"), entitlement)
+    enabled_index["Entitlement"] = frozenset(entitlements_by_name)
+    attr_index["Entitlement"] = entitlements_by_name
+    config["_enabled_index"] = enabled_index
+    config["_attr_index"] = attr_index
+
+
+# Process-wide config cache: {server_id: (config, loaded_at)} in LRU order, shared by
+# every ServerConfiguration regardless of the session it was created with. Writers
+# (insert, evict, reorder) hold the lock; cache hits read without it.
+_CONFIG_CACHE: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+_CONFIG_CACHE_LOCK = threading.Lock()
+_CONFIG_CACHE_TTL = 30  # Cache expires after 30 seconds
+_CONFIG_CACHE_MAX_ENTRIES = 1024
+
+
+def _parse_stored_config(schema_definition: str, previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Parse a stored config, reusing the previously cached object when the text is unchanged.
+    
+    Parsed configs keep the text they were loaded from under the derived "_stored_json"
+    key, so a reload compares strings instead of parsing and comparing whole configs,
+    and an unchanged config keeps its identity (and every cache keyed on it).
+    Raises orjson.JSONDecodeError for invalid JSON.
+    """
+    if previous is not None and previous.get("_stored_json") == schema_definition:
+        return previous
+    config = orjson.loads(schema_definition)
+    config["_stored_json"] = schema_definition
+    _precompute_schema_views(config)
+    return config
+
+
+def _cache_loaded_config(server_id: str, config: Dict[str, Any], loaded_at: float) -> Dict[str, Any]:
+    """Insert a freshly loaded config into the cache and return it."""
+    evicted = []
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE[server_id] = (config, loaded_at)
+        _CONFIG_CACHE.move_to_end(server_id)
+        while len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX_ENTRIES:
+            evicted.append(_CONFIG_CACHE.popitem(last=False)[0])
+    # Derived per-server caches (schemas, plans, generators) follow the eviction
+    for evicted_id in evicted:
+        for hook in _config_change_hooks:
+            hook(evicted_id)
+    return config
+
+
+def get_cached_server_config(server_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the server's cached config while it is fresh, or None.
+    
+    Needs no session and never touches the database, so async code can call it on the
+    event loop; the returned object must be treated as read-only (see get_server_config).
+    """
+    cached = _CONFIG_CACHE.get(server_id)
+    if cached is not None and time.time() - cached[1] < _CONFIG_CACHE_TTL:
+        return cached[0]
+    return None
+
+
+def is_password_support_enabled_in(config: Mapping[str, Any]) -> bool:
+    """Whether a loaded server config enables password support."""
+    return config.get("password_support", {}).get("enabled", False)
+
+
+# App profiles are static per process, so their views are built once; callers get
+# shallow copies and must not mutate the nested values, which are shared
+@lru_cache(maxsize=None)
+def _build_all_app_profiles_view() -> Tuple[MappingProxyType, ...]:
+    """Build the summary of every available app profile."""
+    if _get_app_profile_manager is None:
+        logger.warning("App profiles not available")
+        return ()
+    return tuple(
+        MappingProxyType({
+            "id": app_type.value,
+            "name": profile_config.name,
+            "description": profile_config.description,
+            "app_type": app_type.value
+        })
+        for app_type, profile_config in _get_app_profile_manager().get_all_profiles().items()
+    )
+
+
+@lru_cache(maxsize=64)
+def _build_app_profile_view(app_profile: str) -> Optional[MappingProxyType]:
+    """Build the configuration view of one app profile, or None if it does not exist."""
+    if _get_app_profile_manager is None:
+        logger.warning("App profiles not available: {}", app_profile)
+        return None
+    try:
+        app_type = _AppType(app_profile)
+        app_profile_manager = _get_app_profile_manager()
+        profile = app_profile_manager.get_profile(app_type)
+        if profile:
+            return MappingProxyType({
+                "app_type": app_type.value,
+                "name": profile.name,
+                "description": profile.description,
+                "compatible_entitlements": profile.compatible_entitlements,
+                "compatible_departments": profile.compatible_departments,
+                "compatible_groups": profile.compatible_groups,
+                "user_attributes": [
+                    {
+                        "name": attr.name,
+                        "mutability": attr.mutability.value,
+                        "required": attr.required,
+                        "visible": attr.visible,
+                        "description": attr.description
+                    }
+                    for attr in profile.user_attributes
+                ],
+                "roles": [
+                    {
+                        "name": role.name,
+                        "description": role.description,
+                        "permissions": role.permissions,
+                        "mutability": role.mutability.value
+                    }
+                    for role in profile.roles
+                ],
+                "entitlements": [
+                    {
+                        "name": entitlement.name,
+                        "type": entitlement.type,
+                        "canonical_values": entitlement.canonical_values,
+                        "multi_valued": entitlement.multi_valued,
+                        "mutability": entitlement.mutability.value,
+                        "description": entitlement.description
+                    }
+                    for entitlement in profile.entitlements
+                ]
+            })
+    except ValueError:
+        logger.warning("Invalid app profile: {}", app_profile)
+        return None
 
 
 class ServerConfiguration:
     """Dynamic server-specific configuration manager."""
     
+    # Created per call by get_server_config_manager; all state lives in _CONFIG_CACHE
+    __slots__ = ("db",)
+    
+    _cache_ttl = _CONFIG_CACHE_TTL
+    
     def __init__(self, db: Session):
         self.db = db
-        self._server_configs: Dict[str, Tuple[Dict[str, Any], float]] = {}  # Cache: {server_id: (config, timestamp)}
-        self._cache_ttl = 30  # Cache expires after 30 seconds
     
     def get_server_config(self, server_id: str) -> Dict[str, Any]:
-        """Get configuration for a specific server ID."""
+        """
+        Get configuration for a specific server ID.
+        
+        The returned dict is the shared cached object: callers must not modify it (copy
+        first, or go through update_server_config). Its derived, underscore-prefixed keys
+        are all set before it is cached.
+        """
         current_time = time.time()
         
-        # Check if we have a cached config and if it's still valid
-        if server_id in self._server_configs:
-            config, timestamp = self._server_configs[server_id]
+        # Check if we have a cached config and if it's still valid. Hits read without the
+        # lock: a dict lookup is atomic and entries are replaced whole, never modified.
+        previous = None
+        cached = _CONFIG_CACHE.get(server_id)
+        if cached is not None:
+            config, timestamp = cached
             if current_time - timestamp < self._cache_ttl:
+                # Refreshing the LRU position is best effort; under contention the
+                # order is left slightly stale rather than making readers wait
+                if _CONFIG_CACHE_LOCK.acquire(blocking=False):
+                    try:
+                        if _CONFIG_CACHE.get(server_id) is cached:
+                            _CONFIG_CACHE.move_to_end(server_id)
+                    finally:
+                        _CONFIG_CACHE_LOCK.release()
                 return config
-            else:
-                # Cache expired, remove it
-                del self._server_configs[server_id]
+            # Cache expired, remove it (unless another thread already replaced it)
+            with _CONFIG_CACHE_LOCK:
+                if _CONFIG_CACHE.get(server_id) is cached:
+                    del _CONFIG_CACHE[server_id]
+            previous = config
+        
+        # Load fresh config from database (outside the lock; concurrent misses for the
+        # same server may both load, and the last one wins)
+        return _cache_loaded_config(server_id, self._load_server_config(server_id, previous), current_time)
+    
+    def preload_server_configs(self, server_ids: Iterable[str]) -> None:
+        """
+        Cache the stored configs of several servers with a single query.
+        
+        Servers whose cached config is still fresh are skipped. Servers without a stored
+        (valid) config are left for get_server_config, which creates their defaults.
+        """
+        current_time = time.time()
+        previous: Dict[str, Optional[Dict[str, Any]]] = {}
+        with _CONFIG_CACHE_LOCK:
+            for server_id in server_ids:
+                cached = _CONFIG_CACHE.get(server_id)
+                if cached is None:
+                    previous[server_id] = None
+                elif current_time - cached[1] >= self._cache_ttl:
+                    previous[server_id] = cached[0]
+        if not previous:
+            return
         
-        # Load fresh config from database
-        config = self._load_server_config(server_id)
-        self._server_configs[server_id] = (config, current_time)
-        return config
+        urns = {_config_urn(server_id): server_id for server_id in previous}
+        rows = self.db.query(Schema.urn, Schema.schema_definition).filter(Schema.urn.in_(urns)).all()
+        for urn, schema_definition in rows:
+            server_id = urns[urn]
+            try:
+                config = _parse_stored_config(schema_definition, previous[server_id])
+            except orjson.JSONDecodeError:
+                continue
+            _cache_loaded_config(server_id, config, current_time)
+        logger.debug("Preloaded {} of {} server configurations", len(rows), len(previous))
     
-    def _load_server_config(self, server_id: str) -> Dict[str, Any]:
-        """Load or create server-specific configuration."""
+    def _load_server_config(self, server_id: str, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Load or create server-specific configuration, reusing previous if it is unchanged."""
         # Validate server_id is not None
         if server_id is None:
             raise ValueError("server_id cannot be None")
         
-        # Try to load from database first
-        db_schema = self.db.query(Schema).filter(
-            Schema.urn == f"urn:scim:server:{server_id}:config"
-        ).first()
+        # Try to load from database first; only the JSON column is selected (through the
+        # unique urn index), so no ORM object is built for the row
+        schema_definition = self.db.query(Schema.schema_definition).filter(
+            Schema.urn == _config_urn(server_id)
+        ).scalar()
         
-        if db_schema:
+        if schema_definition is not None:
             try:
-                config = json.loads(db_schema.schema_definition)
-                logger.info(f"Loaded existing configuration for server: {server_id}")
+                config = _parse_stored_config(schema_definition, previous)
+                logger.debug("Loaded existing configuration for server: {}", server_id)
                 return config
-            except json.JSONDecodeError:
-                logger.warning(f"Invalid JSON in server config for {server_id}, using defaults")
+            except orjson.JSONDecodeError:
+                logger.warning("Invalid JSON in server config for {}, using defaults", server_id)
         
         # Create default configuration
-        default_config = self._create_default_config(server_id)
-        self._save_server_config(server_id, default_config)
-        logger.info(f"Created default configuration for server: {server_id}")
+        default_config = self._save_server_config(server_id, self._create_default_config(server_id))
+        logger.info("Created default configuration for server: {}", server_id)
         return default_config
     
     def _create_default_config(self, server_id: str) -> Dict[str, Any]:
@@ -107,12 +391,11 @@ class ServerConfiguration:
     
     def _get_server_entitlement_types(self, server_id: str) -> List[Dict[str, Any]]:
         """Get server-specific entitlement types."""
-        # Use global settings as base, but allow server-specific overrides
-        base_entitlements = settings.cli_entitlement_definitions.copy()
-        
-        # Server-specific modifications could be added here
-        # For now, return the base entitlements
-        return base_entitlements
+        # Use global settings as base, but allow server-specific overrides. No copy is
+        # needed: default configs are serialized on save and the cached config is parsed
+        # back from the stored text, so the settings list is never shared or mutated.
+        # Server-specific modifications could be added here (copy before changing)
+        return settings.cli_entitlement_definitions
     
     def _get_server_user_attributes(self, server_id: str) -> Dict[str, Any]:
         """Get server-specific user attributes."""
@@ -159,140 +442,96 @@ class ServerConfiguration:
             "validate_complex_attributes": True
         }
     
-    def _save_server_config(self, server_id: str, config: Dict[str, Any]) -> None:
-        """Save server configuration to database."""
+    def _save_server_config(self, server_id: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Save server configuration to database and return the newly cached config."""
         # Validate server_id is not None
         if server_id is None:
             raise ValueError("server_id cannot be None")
         
-        schema_urn = f"urn:scim:server:{server_id}:config"
+        schema_urn = _config_urn(server_id)
         
-        # Check if config already exists
-        existing_schema = self.db.query(Schema).filter(
-            Schema.urn == schema_urn
-        ).first()
+        # Derived caches (underscore-prefixed keys) are rebuilt after load and never persisted
+        schema_definition = _dump_config(strip_derived_keys(config))
         
-        if existing_schema:
-            existing_schema.schema_definition = json.dumps(config)
-        else:
-            new_schema = Schema(
-                urn=schema_urn,
-                name=f"Server Configuration - {server_id}",
-                description=f"Configuration for SCIM server {server_id}",
-                schema_definition=json.dumps(config),
-                server_id=server_id
+        values = {
+            "urn": schema_urn,
+            "name": f"Server Configuration - {server_id}",
+            "description": f"Configuration for SCIM server {server_id}",
+            "schema_definition": schema_definition,
+            "server_id": server_id
+        }
+        upsert_insert = _UPSERT_INSERTS.get(self.db.get_bind().dialect.name)
+        if upsert_insert is not None:
+            # Single INSERT ... ON CONFLICT (urn) DO UPDATE statement
+            stmt = upsert_insert(Schema.__table__).values(**values).on_conflict_do_update(
+                index_elements=[Schema.__table__.c.urn],
+                set_={"schema_definition": schema_definition, "updated_at": func.now()}
             )
-            self.db.add(new_schema)
+            self.db.execute(stmt)
+        else:
+            # Dialects without ON CONFLICT: Core UPDATE in place, Core INSERT only when no
+            # row matched; no ORM object is created either way
+            updated = self.db.execute(
+                update(Schema.__table__)
+                .where(Schema.__table__.c.urn == schema_urn)
+                .values(schema_definition=schema_definition, updated_at=func.now())
+            ).rowcount
+            if not updated:
+                self.db.execute(insert(Schema.__table__).values(**values))
         
         self.db.commit()
-        logger.info(f"Saved configuration for server: {server_id}")
+        # Cached configs are never modified in place: the saved config replaces the entry
+        # as a new object, parsed back from the stored text so it shares nothing with
+        # the caller's dict
+        saved_config = _cache_loaded_config(
+            server_id, _parse_stored_config(schema_definition, None), time.time()
+        )
+        for hook in _config_change_hooks:
+            hook(server_id)
+        logger.info("Saved configuration for server: {}", server_id)
+        return saved_config
     
     def update_server_config(self, server_id: str, updates: Dict[str, Any]) -> None:
         """Update server configuration."""
         current_config = self.get_server_config(server_id)
         
         # Deep merge updates
-        def deep_merge(base: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
-            result = base.copy()
-            for key, value in updates.items():
-                if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                    result[key] = deep_merge(result[key], value)
-                else:
-                    result[key] = value
-            return result
-        
-        updated_config = deep_merge(current_config, updates)
+        updated_config = _deep_merge(current_config, updates)
         self._save_server_config(server_id, updated_config)
         
-        # Clear cache
-        if server_id in self._server_configs:
-            del self._server_configs[server_id]
-        
-        logger.info(f"Updated configuration for server: {server_id}")
+        logger.info("Updated configuration for server: {}", server_id)
     
     def get_server_attribute_config(self, server_id: str, resource_type: str, attribute_name: str) -> Optional[Dict[str, Any]]:
         """Get server-specific attribute configuration."""
         config = self.get_server_config(server_id)
-        
-        if resource_type == "User":
-            attributes = config.get("user_attributes", {})
-        elif resource_type == "Group":
-            attributes = config.get("group_attributes", {})
-        elif resource_type == "Entitlement":
-            # Entitlements use the entitlement_types configuration
-            for entitlement in config.get("entitlement_types", []):
-                if entitlement.get("name") == attribute_name:
-                    return entitlement
-            return None
-        else:
-            return None
-        
-        # Check custom attributes
-        custom_attrs = attributes.get("custom_attributes", {})
-        if attribute_name in custom_attrs:
-            return custom_attrs[attribute_name]
-        
-        # Check complex attributes
-        complex_attrs = attributes.get("complex_attributes", {})
-        if attribute_name in complex_attrs:
-            return complex_attrs[attribute_name]
-        
-        return None
+        attributes = config["_attr_index"].get(resource_type)
+        return attributes.get(attribute_name) if attributes is not None else None
     
-    def get_server_validation_rules(self, server_id: str) -> Dict[str, Any]:
+    def get_server_validation_rules(self, server_id: str) -> Mapping[str, Any]:
         """Get server-specific validation rules."""
         config = self.get_server_config(server_id)
-        return config.get("validation_rules", {})
+        return MappingProxyType(config.get("validation_rules", {}))
     
     def is_attribute_enabled(self, server_id: str, resource_type: str, attribute_name: str) -> bool:
         """Check if an attribute is enabled for a specific server."""
         config = self.get_server_config(server_id)
-        
-        if resource_type == "User":
-            required_attrs = config.get("user_attributes", {}).get("required_attributes", [])
-            optional_attrs = config.get("user_attributes", {}).get("optional_attributes", [])
-            custom_attrs = config.get("user_attributes", {}).get("custom_attributes", {})
-            complex_attrs = config.get("user_attributes", {}).get("complex_attributes", {})
-            
-            return (attribute_name in required_attrs or 
-                   attribute_name in optional_attrs or 
-                   attribute_name in custom_attrs or 
-                   attribute_name in complex_attrs)
-        
-        elif resource_type == "Group":
-            required_attrs = config.get("group_attributes", {}).get("required_attributes", [])
-            optional_attrs = config.get("group_attributes", {}).get("optional_attributes", [])
-            custom_attrs = config.get("group_attributes", {}).get("custom_attributes", {})
-            complex_attrs = config.get("group_attributes", {}).get("complex_attributes", {})
-            
-            return (attribute_name in required_attrs or 
-                   attribute_name in optional_attrs or 
-                   attribute_name in custom_attrs or 
-                   attribute_name in complex_attrs)
-        
-        elif resource_type == "Entitlement":
-            # Check if attribute exists in entitlement types
-            for entitlement in config.get("entitlement_types", []):
-                if entitlement.get("name") == attribute_name:
-                    return True
-            return False
-        
-        return False
+        enabled = config["_enabled_index"].get(resource_type)
+        return enabled is not None and attribute_name in enabled
     
     def get_enabled_resource_types(self, server_id: str) -> List[str]:
         """Get enabled resource types for a server."""
         config = self.get_server_config(server_id)
         return config.get("enabled_resource_types", ["User", "Group", "Entitlement"])
     
-    def get_server_rate_limits(self, server_id: str) -> Dict[str, int]:
+    def get_server_rate_limits(self, server_id: str) -> Mapping[str, int]:
         """Get server-specific rate limits."""
         config = self.get_server_config(server_id)
-        return config.get("rate_limits", {
+        return MappingProxyType(config.get("rate_limits", {
             "create": settings.rate_limit_create,
             "read": settings.rate_limit_read,
             "update": settings.rate_limit_create,
             "delete": settings.rate_limit_create
-        })
+        }))
     
     def get_server_app_profile(self, server_id: str) -> Optional[str]:
         """Get the app profile for a specific server."""
@@ -301,112 +540,42 @@ class ServerConfiguration:
     
     def set_server_app_profile(self, server_id: str, app_profile: str) -> None:
         """Set the app profile for a specific server."""
-        config = self.get_server_config(server_id)
-        config["app_profile"] = app_profile
-        self._save_server_config(server_id, config)
-        logger.info(f"Set app profile '{app_profile}' for server {server_id}")
+        # Saved as a new config object; the cached one is shared and never modified
+        self.update_server_config(server_id, {"app_profile": app_profile})
+        logger.info("Set app profile '{}' for server {}", app_profile, server_id)
     
     def get_available_app_profiles(self) -> List[Dict[str, Any]]:
         """Get list of available app profiles."""
-        try:
-            # Import here to avoid circular imports
-            from .app_profiles import get_app_profile_manager
-            profiles = []
-            app_profile_manager = get_app_profile_manager()
-            for app_type, profile_config in app_profile_manager.get_all_profiles().items():
-                profiles.append({
-                    "id": app_type.value,
-                    "name": profile_config.name,
-                    "description": profile_config.description,
-                    "app_type": app_type.value
-                })
-            return profiles
-        except ImportError:
-            logger.warning("App profiles not available")
-            return []
+        return [dict(profile) for profile in _build_all_app_profiles_view()]
     
     def get_app_profile_config(self, app_profile: str) -> Optional[Dict[str, Any]]:
         """Get configuration for a specific app profile."""
-        try:
-            # Import here to avoid circular imports
-            from .app_profiles import get_app_profile_manager, AppType
-            app_type = AppType(app_profile)
-            app_profile_manager = get_app_profile_manager()
-            profile = app_profile_manager.get_profile(app_type)
-            if profile:
-                return {
-                    "app_type": app_type.value,
-                    "name": profile.name,
-                    "description": profile.description,
-                    "compatible_entitlements": profile.compatible_entitlements,
-                    "compatible_departments": profile.compatible_departments,
-                    "compatible_groups": profile.compatible_groups,
-                    "user_attributes": [
-                        {
-                            "name": attr.name,
-                            "mutability": attr.mutability.value,
-                            "required": attr.required,
-                            "visible": attr.visible,
-                            "description": attr.description
-                        }
-                        for attr in profile.user_attributes
-                    ],
-                    "roles": [
-                        {
-                            "name": role.name,
-                            "description": role.description,
-                            "permissions": role.permissions,
-                            "mutability": role.mutability.value
-                        }
-                        for role in profile.roles
-                    ],
-                    "entitlements": [
-                        {
-                            "name": entitlement.name,
-                            "type": entitlement.type,
-                            "canonical_values": entitlement.canonical_values,
-                            "multi_valued": entitlement.multi_valued,
-                            "mutability": entitlement.mutability.value,
-                            "description": entitlement.description
-                        }
-                        for entitlement in profile.entitlements
-                    ]
-                }
-        except ValueError:
-            logger.warning(f"Invalid app profile: {app_profile}")
-            return None
-        except ImportError:
-            logger.warning(f"App profiles not available: {app_profile}")
-            return None
+        view = _build_app_profile_view(app_profile)
+        return dict(view) if view is not None else None
     
     def is_password_support_enabled(self, server_id: str) -> bool:
         """Check if password support is enabled for a server."""
-        config = self.get_server_config(server_id)
-        password_config = config.get("password_support", {})
-        return password_config.get("enabled", False)
+        return is_password_support_enabled_in(self.get_server_config(server_id))
     
-    def get_password_validation_rules(self, server_id: str) -> Dict[str, Any]:
-        """Get password validation rules for a server."""
+    def get_password_validation_rules(self, server_id: str) -> Mapping[str, Any]:
+        """Get password validation rules for a server (read-only view)."""
         config = self.get_server_config(server_id)
         password_config = config.get("password_support", {})
-        return password_config.get("password_validation", {})
+        return MappingProxyType(password_config.get("password_validation", {}))
     
     def enable_password_support(self, server_id: str, enabled: bool = True) -> None:
         """Enable or disable password support for a server."""
-        config = self.get_server_config(server_id)
-        if "password_support" not in config:
-            config["password_support"] = {}
-        config["password_support"]["enabled"] = enabled
-        self._save_server_config(server_id, config)
-        logger.info(f"Password support {'enabled' if enabled else 'disabled'} for server: {server_id}")
+        # Saved as a new config object; the cached one is shared and never modified
+        self.update_server_config(server_id, {"password_support": {"enabled": enabled}})
+        logger.info("Password support {} for server: {}", "enabled" if enabled else "disabled", server_id)
 
 
-# Global server configuration manager
-_server_config_manager = None
-
 def get_server_config_manager(db: Session) -> ServerConfiguration:
-    """Get the global server configuration manager."""
-    global _server_config_manager
-    if _server_config_manager is None:
-        _server_config_manager = ServerConfiguration(db)
-    return _server_config_manager 
\ No newline at end of file
+    """
+    Get a server configuration manager bound to the given session.
+    
+    Managers are cheap per-call views: the config cache is process-wide, and database
+    reads and writes go through the caller's session rather than whichever session
+    happened to create a long-lived manager.
+    """
+    return ServerConfiguration(db) 
\ No newline at end of file
@@ -40,7 +40,7 @@ class ServerContextManager:
     def create_dependency(self, source: Optional[ServerIdSource] = None) -> Callable:
         return self.get_extractor(source)
 
-def get_server_id_from_path(server_id: str = Path(..., description="Server identifier")) -> str:
+async def get_server_id_from_path(server_id: str = Path(..., description="Server identifier")) -> str:
     return server_id
 
 def configure_server_id_source(source: ServerIdSource):
@@ -10,7 +10,7 @@ from .response_converter import user_converter
 from .schemas import UserCreate, UserUpdate, UserResponse, UserListResponse
 
 # Create router
-from .config import settings
+from .config import settings, CREATE_RATE_LIMIT
 
 # Construct the API prefix dynamically
 api_prefix = f"{settings.api_base_path}/scim/v2/Users"
@@ -45,10 +45,14 @@ from slowapi.util import get_remote_address
 from loguru import logger
 
 # Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_remote_address,
+    strategy=settings.rate_limit_strategy,
+    storage_uri=settings.rate_limit_storage_uri,
+)
 
 @router.patch("/{user_id}/password")
-@limiter.limit(f"{settings.rate_limit_create}/{settings.rate_limit_window}minute")
+@limiter.limit(CREATE_RATE_LIMIT)
 async def change_user_password(
     user_id: str,
     request: Request,
@@ -35,7 +35,7 @@ from scim_server.crud_simple import (
 )
 from scim_server.schemas import UserCreate, GroupCreate, EntitlementCreate
 from scim_server.config import settings
-from scim_server.server_config import get_server_config_manager
+from scim_server.server_config import get_server_config_manager, strip_derived_keys
 from loguru import logger
 
 class SCIMCLI:
@@ -584,7 +584,8 @@ class SCIMCLI:
         try:
             config_manager = get_server_config_manager(self.db)
             config = config_manager.get_server_config(server_id)
-            return config
+            # Derived (underscore-prefixed) keys are internal caches, not configuration
+            return strip_derived_keys(config)
         except Exception as e:
             logger.error(f"Error getting server config for {server_id}: {e}")
             return {"error": str(e)}
@@ -699,7 +700,7 @@ class SCIMCLI:
         try:
             server_config = get_server_config_manager(self.db)
             is_enabled = server_config.is_password_support_enabled(server_id)
-            validation_rules = server_config.get_password_validation_rules(server_id)
+            validation_rules = dict(server_config.get_password_validation_rules(server_id))
             return {
                 "success": True,
                 "server_id": server_id,
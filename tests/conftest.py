@@ -5,7 +5,7 @@ from sqlalchemy.orm import sessionmaker
 # Removed hashlib import - no longer needed
 
 from scim_server.main import app
-from scim_server.database import Base, get_db, SessionLocal
+from scim_server.database import Base, get_db, get_db_factory, SessionLocal
 from scim_server.models import User, Group, Entitlement
 from loguru import logger
 
@@ -171,6 +171,7 @@ def db_session(db_engine):
 def client(db_session):
     """Create test client with database session."""
     app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_db_factory] = lambda: lambda: db_session
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
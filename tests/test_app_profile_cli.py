@@ -223,6 +223,16 @@ class TestAppProfileCLIOutputFormatting:
         config = parsed_result["config"]
         assert config["app_type"] == "hr"
         assert config["name"] == "Human Resources"
+    
+    def test_cli_server_config_json_output(self):
+        """Test CLI server config output is JSON-serializable and free of derived keys."""
+        cli = SCIMCLI()
+        
+        result = cli.get_server_config("cli-config-json-test")
+        parsed_result = json.loads(json.dumps(result))
+        
+        assert parsed_result["server_id"] == "cli-config-json-test"
+        assert not any(key.startswith("_") for key in parsed_result)
 
 
 class TestAppProfileCLIArgumentParsing:
@@ -362,6 +362,20 @@ class TestAppProfileServerConfiguration:
         # Test getting invalid app profile config
         invalid_config = config_manager.get_app_profile_config("invalid")
         assert invalid_config is None
+    
+    def test_app_profile_views_are_built_once(self, db_session: Session):
+        """App profile views are cached; callers get copies they can change safely."""
+        config_manager = get_server_config_manager(db_session)
+        
+        first = config_manager.get_app_profile_config("hr")
+        first["name"] = "Changed"
+        second = config_manager.get_app_profile_config("hr")
+        assert second["name"] == "Human Resources"
+        assert second["roles"] is first["roles"]
+        
+        profiles = config_manager.get_available_app_profiles()
+        profiles[0]["name"] = "Changed"
+        assert config_manager.get_available_app_profiles()[0]["name"] != "Changed"
 
 
 class TestAppProfileDatabaseOperations:
@@ -207,6 +207,26 @@ class TestBaseCRUD(DynamicTestDataMixin):
         assert len(users) >= 3
         assert all(user.server_id == "test-server" for user in users)
 
+    def test_base_crud_count_operation(self, db_session):
+        """Test BaseCRUD count with and without a SCIM filter."""
+        from scim_server.models import User
+        
+        crud = BaseCRUD(User)
+        server_id = "test-server-count"
+        
+        for i in range(3):
+            user_data = {
+                "scim_id": f"test-user-count-{i}",
+                "user_name": f"counted-{i}" if i else "other-user",
+                "display_name": f"Test User Count {i}"
+            }
+            crud.create(db_session, user_data, server_id)
+        
+        assert crud.count(db_session, server_id) == 3
+        assert crud.count(db_session, server_id, 'userName co "counted"') == 2
+        assert crud.count(db_session, server_id, 'userName eq "other-user"') == 1
+        assert crud.count(db_session, "test-server-count-empty") == 0
+
     def test_base_crud_update_operation(self, db_session):
         """Test BaseCRUD update operation."""
         from scim_server.models import User
@@ -162,6 +162,52 @@ class TestErrorHandling(DynamicTestDataMixin):
                                     "Content-Type": "application/json"})
         assert response.status_code == 422
 
+    def test_scim_routes_parse_json_with_orjson(self, client, sample_api_key):
+        """SCIM routes decode bodies with orjson and still report malformed JSON as 422."""
+        from fastapi.routing import APIRoute
+        from scim_server.json_routing import ORJSONRoute
+
+        scim_routes = [
+            route for route in app.routes
+            if isinstance(route, APIRoute) and route.path.startswith("/scim-identifier/")
+        ]
+        assert scim_routes
+        assert all(isinstance(route, ORJSONRoute) for route in scim_routes)
+
+        response = client.post("/scim-identifier/test-server/scim/v2/Users/",
+                             content=b'{"userName": ',
+                             headers={"Authorization": f"Bearer {sample_api_key}",
+                                    "Content-Type": "application/scim+json"})
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["type"] == "json_invalid"
+
+    def test_orjson_routes_keep_large_integers_exact(self):
+        """Integers beyond 64 bits are rejected with a 400 instead of decoded as floats."""
+        from fastapi import APIRouter, FastAPI, Request
+        from scim_server.json_routing import ORJSONRoute
+
+        echo_app = FastAPI()
+        router = APIRouter(route_class=ORJSONRoute)
+
+        @router.post("/echo")
+        async def echo(request: Request):
+            body = await request.json()
+            return {"value": str(body["value"]), "is_int": type(body["value"]) is int}
+
+        echo_app.include_router(router)
+        with TestClient(echo_app) as echo_client:
+            for value in ("42", "18446744073709551615", "-9223372036854775808"):
+                response = echo_client.post("/echo", content=f'{{"value": {value}}}')
+                assert response.json() == {"value": value, "is_int": True}
+
+            for value in ("123456789012345678901234567890", "18446744073709551616", "-9223372036854775809"):
+                response = echo_client.post("/echo", content=f'{{"value": [{{"n": {value}}}]}}')
+                assert response.status_code == 400
+                assert response.json()["detail"]["type"] == "integer_out_of_range"
+
+            response = echo_client.post("/echo", content='{"value": "123456789012345678901234567890"}')
+            assert response.json() == {"value": "123456789012345678901234567890", "is_int": False}
+
     def test_invalid_content_type(self, client, sample_api_key):
         """Test handling of invalid content type."""
         test_server_id = "test-server"
@@ -52,6 +52,38 @@ class TestSchemaDiscovery:
             assert "schema" in resource
             assert "description" in resource
 
+    def test_discovery_trailing_slash(self, client, sample_api_key):
+        """Discovery endpoints answer with and without a trailing slash."""
+        headers = {"Authorization": f"Bearer {sample_api_key}"}
+        for endpoint in ("ServiceProviderConfig", "ResourceTypes", "Schemas"):
+            plain = client.get(f"/scim-identifier/test-server/scim/v2/{endpoint}", headers=headers)
+            slashed = client.get(f"/scim-identifier/test-server/scim/v2/{endpoint}/", headers=headers)
+            assert plain.status_code == slashed.status_code == 200
+            assert plain.content == slashed.content
+
+    def test_trailing_slash_kept_outside_scim_paths(self, client):
+        """Mounted apps outside the SCIM prefix see their paths unchanged (no redirect loop)."""
+        response = client.get("/frontend/static/", follow_redirects=False)
+        assert response.status_code == 404
+
+    def test_discovery_etag_not_modified(self, client, sample_api_key):
+        """Discovery responses carry an ETag and answer a matching If-None-Match with 304."""
+        headers = {"Authorization": f"Bearer {sample_api_key}"}
+        for endpoint in ("ServiceProviderConfig", "ResourceTypes", "Schemas"):
+            url = f"/scim-identifier/test-server/scim/v2/{endpoint}"
+            response = client.get(url, headers=headers)
+            etag = response.headers["ETag"]
+            assert response.headers["Content-Type"] == "application/scim+json"
+            assert response.headers["Cache-Control"] == "private, max-age=60"
+
+            not_modified = client.get(url, headers={**headers, "If-None-Match": etag})
+            assert not_modified.status_code == 304
+            assert not_modified.content == b""
+            assert not_modified.headers["ETag"] == etag
+
+            stale = client.get(url, headers={**headers, "If-None-Match": '"stale"'})
+            assert stale.status_code == 200
+
     def test_schemas_no_auth(self, client):
         """Test Schemas endpoint without authentication."""
         response = client.get("/scim-identifier/test-server/scim/v2/Schemas")
@@ -125,4 +157,375 @@ class TestSchemaDiscovery:
             assert "name" in resource
             assert "endpoint" in resource
             assert "schema" in resource
-            assert "description" in resource 
\ No newline at end of file
+            assert "description" in resource 
+
+class TestDynamicSchemaGeneration:
+    """Tests for server-specific schema generation and its caches."""
+
+    def test_entitlement_canonical_values_flattened(self, db_session):
+        """Entitlement 'type' canonical values are the flattened server entitlement types."""
+        from scim_server.schema_definitions import DynamicSchemaGenerator
+
+        generator = DynamicSchemaGenerator(db_session, "schema-gen-test")
+        expected = [
+            value
+            for entitlement in generator.server_config.get("entitlement_types", [])
+            for value in entitlement.get("canonical_values", [])
+        ]
+
+        schema = generator.get_entitlement_schema()
+        type_attr = next(attr for attr in schema["attributes"] if attr["name"] == "type")
+        assert type_attr["canonicalValues"] == expected
+
+    def test_derived_config_caches_not_persisted(self, db_session):
+        """Underscore-prefixed derived caches never reach the stored configuration."""
+        import json
+        from scim_server.models import Schema
+        from scim_server.schema_definitions import DynamicSchemaGenerator
+        from scim_server.server_config import get_server_config_manager
+
+        server_id = "schema-gen-persist-test"
+        generator = DynamicSchemaGenerator(db_session, server_id)
+        generator.get_entitlement_schema()
+        config_manager = get_server_config_manager(db_session)
+        config_manager.set_server_app_profile(server_id, "hr")
+
+        stored = config_manager.db.query(Schema).filter(
+            Schema.urn == f"urn:scim:server:{server_id}:config"
+        ).first()
+        assert not any(key.startswith("_") for key in json.loads(stored.schema_definition))
+
+    def test_schema_bytes_match_schema_dicts(self, db_session):
+        """Pre-serialized schema bytes decode to the generated schemas and are reused."""
+        import json
+        from scim_server.schema_definitions import DynamicSchemaGenerator
+
+        generator = DynamicSchemaGenerator(db_session, "schema-bytes-test")
+        blobs = generator.get_all_schemas_bytes()
+
+        assert [json.loads(blob) for blob in blobs] == json.loads(json.dumps(generator.get_all_schemas()))
+        assert generator.get_user_schema_bytes() is generator.get_user_schema_bytes()
+
+    def test_schemas_returned_by_identity(self, db_session):
+        """Schemas are memoized per server config and expose immutable attribute tuples."""
+        from scim_server.schema_definitions import DynamicSchemaGenerator
+
+        generator = DynamicSchemaGenerator(db_session, "schema-identity-test")
+        schema = generator.get_user_schema()
+
+        assert isinstance(schema["attributes"], tuple)
+        assert DynamicSchemaGenerator(db_session, "schema-identity-test").get_user_schema() is schema
+        assert generator.get_all_schemas() is generator.get_all_schemas()
+
+    def test_resource_types_response_shared(self, db_session):
+        """The ResourceTypes ListResponse is built once and shared across servers."""
+        from scim_server.schema_definitions import DynamicSchemaGenerator
+
+        response = DynamicSchemaGenerator(db_session, "resource-types-a").get_resource_types_response()
+
+        assert DynamicSchemaGenerator(db_session, "resource-types-b").get_resource_types_response() is response
+        assert response["totalResults"] == len(response["Resources"]) == 3
+        assert DynamicSchemaGenerator(db_session, "resource-types-a").get_resource_types() == list(response["Resources"])
+        with pytest.raises(TypeError):
+            response["totalResults"] = 0
+
+    def test_resource_types_bytes_match_response(self, db_session):
+        """The serialized ResourceTypes response matches the dict and is reused."""
+        import json
+        from scim_server.schema_definitions import DynamicSchemaGenerator
+
+        generator = DynamicSchemaGenerator(db_session, "resource-types-bytes")
+        content = generator.get_resource_types_response_bytes()
+
+        data = json.loads(content)
+        response = generator.get_resource_types_response()
+        assert data["totalResults"] == response["totalResults"]
+        assert [rt["id"] for rt in data["Resources"]] == [rt["id"] for rt in response["Resources"]]
+        assert data["Resources"][0]["schemas"] == list(response["Resources"][0]["schemas"])
+        assert generator.get_resource_types_response_bytes() is content
+
+    def test_unchanged_config_reload_keeps_schema_cache(self, db_session):
+        """Reloading an unchanged config after TTL expiry keeps identity-keyed caches warm."""
+        from scim_server.schema_definitions import DynamicSchemaGenerator
+        from scim_server.server_config import _CONFIG_CACHE
+
+        server_id = "schema-reload-test"
+        generator = DynamicSchemaGenerator(db_session, server_id)
+        schema = generator.get_user_schema()
+
+        config, _ = _CONFIG_CACHE[server_id]
+        _CONFIG_CACHE[server_id] = (config, 0.0)
+
+        reloaded = DynamicSchemaGenerator(db_session, server_id)
+        assert reloaded.server_config is config
+        assert reloaded.get_user_schema() is schema
+
+    def test_cached_server_config_tracks_ttl(self, db_session):
+        """get_cached_server_config only returns configs a read would serve from the cache."""
+        from scim_server.server_config import _CONFIG_CACHE, get_cached_server_config, get_server_config_manager
+
+        server_id = "fresh-config-test"
+        config_manager = get_server_config_manager(db_session)
+        _CONFIG_CACHE.pop(server_id, None)
+        assert get_cached_server_config(server_id) is None
+
+        config = config_manager.get_server_config(server_id)
+        assert get_cached_server_config(server_id) is config
+
+        _CONFIG_CACHE[server_id] = (config, 0.0)
+        assert get_cached_server_config(server_id) is None
+
+    def test_cached_discovery_hit_opens_no_session(self, client, db_session, sample_api_key):
+        """Discovery requests served from the config cache never create a database session."""
+        from scim_server.main import app
+        from scim_server.database import get_db_factory
+        from scim_server.schema_definitions import URN_USER
+        from scim_server.server_config import get_server_config_manager
+
+        server_id = "no-session-test"
+        get_server_config_manager(db_session).get_server_config(server_id)
+
+        sessions = []
+
+        def factory():
+            sessions.append(db_session)
+            return db_session
+
+        app.dependency_overrides[get_db_factory] = lambda: factory
+        for endpoint in ("ServiceProviderConfig", "ResourceTypes", "Schemas", f"Schemas/{URN_USER}"):
+            response = client.get(
+                f"/scim-identifier/{server_id}/scim/v2/{endpoint}",
+                headers={"Authorization": f"Bearer {sample_api_key}"}
+            )
+            assert response.status_code == 200
+        assert sessions == []
+
+    def test_discovery_config_loaded_off_event_loop(self, db_session, monkeypatch):
+        """An expired config is reloaded in the threadpool and handed back to the handler."""
+        import asyncio
+        import threading
+        from scim_server.scim_endpoints import _ensure_server_config
+        from scim_server.server_config import _CONFIG_CACHE, ServerConfiguration, get_server_config_manager
+
+        server_id = "ensure-config-test"
+        config = get_server_config_manager(db_session).get_server_config(server_id)
+        _CONFIG_CACHE[server_id] = (config, 0.0)
+
+        load_threads = []
+        get_server_config = ServerConfiguration.get_server_config
+
+        def recording_get_server_config(self, requested_id):
+            load_threads.append(threading.current_thread())
+            return get_server_config(self, requested_id)
+
+        monkeypatch.setattr(ServerConfiguration, "get_server_config", recording_get_server_config)
+
+        assert asyncio.run(_ensure_server_config(lambda: db_session, server_id)) is config
+        assert load_threads and threading.main_thread() not in load_threads
+
+        load_threads.clear()
+        assert asyncio.run(_ensure_server_config(lambda: db_session, server_id)) is config
+        assert load_threads == []
+
+    def test_schemas_response_bytes_cached(self, db_session):
+        """The /Schemas ListResponse is assembled from the per-schema bytes once per config."""
+        import json
+        from scim_server.schema_definitions import DynamicSchemaGenerator
+
+        generator = DynamicSchemaGenerator(db_session, "schemas-response-test")
+        content = generator.get_schemas_response_bytes()
+        data = json.loads(content)
+
+        assert data["totalResults"] == data["itemsPerPage"] == len(data["Resources"])
+        assert data["Resources"] == [json.loads(blob) for blob in generator.get_all_schemas_bytes()]
+        assert generator.get_schemas_response_bytes() is content
+
+    def test_discovery_dependencies_are_flat(self):
+        """Discovery routes resolve one flat auth/rate-limit dependency plus the session factory."""
+        from fastapi.routing import APIRoute
+        from scim_server.main import app
+        from scim_server.scim_endpoints import discovery_server_id
+        from scim_server.database import get_db_factory
+
+        discovery_paths = {
+            "/scim-identifier/{server_id}/scim/v2/ServiceProviderConfig",
+            "/scim-identifier/{server_id}/scim/v2/ResourceTypes",
+            "/scim-identifier/{server_id}/scim/v2/Schemas",
+            "/scim-identifier/{server_id}/scim/v2/Schemas/{schema_urn}",
+        }
+        routes = [route for route in app.routes if isinstance(route, APIRoute) and route.path in discovery_paths]
+
+        assert len(routes) == len(discovery_paths)
+        for route in routes:
+            calls = [dependency.call for dependency in route.dependant.dependencies]
+            assert calls == [discovery_server_id, get_db_factory]
+            assert all(not dependency.dependencies for dependency in route.dependant.dependencies)
+
+    def test_route_table_has_no_duplicates(self):
+        """Every method/path pair is routed exactly once."""
+        from collections import Counter
+        from fastapi.routing import APIRoute
+        from scim_server.main import app
+
+        registrations = Counter(
+            (method, route.path)
+            for route in app.routes if isinstance(route, APIRoute)
+            for method in route.methods
+        )
+        assert [key for key, count in registrations.items() if count > 1] == []
+
+    def test_generator_pool_reuses_instance_per_config(self, db_session):
+        """for_server shares one generator per server until its configuration changes."""
+        from scim_server.schema_definitions import DynamicSchemaGenerator
+        from scim_server.server_config import get_server_config_manager
+
+        server_id = "generator-pool-test"
+        generator = DynamicSchemaGenerator.for_server(db_session, server_id)
+
+        assert DynamicSchemaGenerator.for_server(db_session, server_id) is generator
+        assert generator.db is None
+
+        get_server_config_manager(db_session).set_server_app_profile(server_id, "hr")
+        assert DynamicSchemaGenerator.for_server(db_session, server_id) is not generator
+
+    def test_cache_invalidation_tolerates_concurrent_inserts(self, monkeypatch):
+        """Invalidation hooks never fail while other threads insert into the derived caches."""
+        import sys
+        import threading
+        from scim_server import schema_definitions, schema_validator
+
+        monkeypatch.setattr(schema_definitions, "_SCHEMA_CACHE", {})
+        monkeypatch.setattr(schema_validator, "_PLAN_CACHE", {})
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for index in range(2000):
+                schema_definitions._SCHEMA_CACHE[("concurrent", str(index))] = (None, None)
+                schema_validator._PLAN_CACHE[("concurrent", str(index))] = (None, None)
+
+            errors = []
+            done = threading.Event()
+
+            def insert():
+                index = 0
+                while not done.is_set():
+                    index += 1
+                    schema_definitions._SCHEMA_CACHE[("inserted", str(index))] = (None, None)
+                    schema_validator._PLAN_CACHE[("inserted", str(index))] = (None, None)
+
+            def invalidate():
+                try:
+                    for _ in range(50):
+                        schema_definitions.invalidate_schema_caches("concurrent")
+                        schema_validator.invalidate_plans("concurrent")
+                except RuntimeError as exc:
+                    errors.append(exc)
+                finally:
+                    done.set()
+
+            threads = [threading.Thread(target=insert), threading.Thread(target=invalidate)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        assert errors == []
+        assert not any(key[0] == "concurrent" for key in schema_definitions._SCHEMA_CACHE)
+        assert not any(key[0] == "concurrent" for key in schema_validator._PLAN_CACHE)
+
+    def test_is_attribute_enabled_uses_precomputed_index(self, db_session):
+        """Enabled attributes come from the per-config index built at load time."""
+        from scim_server.server_config import get_server_config_manager
+
+        server_id = "enabled-index-test"
+        config_manager = get_server_config_manager(db_session)
+        config = config_manager.get_server_config(server_id)
+        entitlement_name = config["entitlement_types"][0]["name"]
+
+        assert config_manager.is_attribute_enabled(server_id, "User", "userName")
+        assert config_manager.is_attribute_enabled(server_id, "User", "emails")
+        assert config_manager.is_attribute_enabled(server_id, "Group", "description")
+        assert config_manager.is_attribute_enabled(server_id, "Entitlement", entitlement_name)
+        assert not config_manager.is_attribute_enabled(server_id, "User", "unknownAttribute")
+        assert not config_manager.is_attribute_enabled(server_id, "Unknown", "userName")
+
+    def test_attribute_config_lookup_table(self, db_session):
+        """Attribute definitions resolve through the per-config lookup table."""
+        from scim_server.server_config import get_server_config_manager
+
+        server_id = "attr-index-test"
+        config_manager = get_server_config_manager(db_session)
+        config = config_manager.get_server_config(server_id)
+        entitlement = config["entitlement_types"][0]
+
+        emails = config_manager.get_server_attribute_config(server_id, "User", "emails")
+        assert emails is config["user_attributes"]["complex_attributes"]["emails"]
+        assert config_manager.get_server_attribute_config(server_id, "Entitlement", entitlement["name"]) is entitlement
+        assert config_manager.get_server_attribute_config(server_id, "User", "userName") is None
+        assert config_manager.get_server_attribute_config(server_id, "Unknown", "emails") is None
+
+    def test_config_json_follows_saves(self, db_session):
+        """The cached stored-JSON text stays in sync with saved configuration changes."""
+        import orjson
+        from scim_server.server_config import get_server_config_manager, strip_derived_keys
+
+        server_id = "config-json-test"
+        config_manager = get_server_config_manager(db_session)
+        config = config_manager.get_server_config(server_id)
+        assert orjson.loads(config["_stored_json"]) == strip_derived_keys(config)
+
+        config_manager.enable_password_support(server_id)
+        stored = orjson.loads(config_manager.get_server_config(server_id)["_stored_json"])
+        assert stored["password_support"]["enabled"] is True
+
+
+class TestDiscoveryRateLimit:
+    """Tests for the in-process discovery rate limit."""
+
+    def test_discovery_token_bucket(self):
+        """The discovery token bucket allows bursts up to capacity, then refills over time."""
+        from scim_server.local_bucket import TokenBucket
+
+        bucket = TokenBucket(capacity=2.0, rate=1.0)
+        assert bucket.consume()
+        assert bucket.consume()
+        assert not bucket.consume()
+
+        bucket.last -= 1.5
+        assert bucket.consume()
+        assert not bucket.consume()
+
+    def test_discovery_buckets_are_lru_bounded(self, monkeypatch):
+        """The per-client bucket table evicts least recently seen clients beyond its cap."""
+        import asyncio
+        from types import SimpleNamespace
+        import scim_server.local_bucket as local_bucket
+
+        monkeypatch.setattr(local_bucket, "_discovery_buckets", local_bucket.OrderedDict())
+        monkeypatch.setattr(local_bucket, "_DISCOVERY_MAX_CLIENTS", 2)
+
+        for host in ("10.0.0.1", "10.0.0.2", "10.0.0.1", "10.0.0.3"):
+            request = SimpleNamespace(client=SimpleNamespace(host=host))
+            asyncio.run(local_bucket.check_discovery_rate_limit(request))
+
+        assert list(local_bucket._discovery_buckets) == ["10.0.0.1", "10.0.0.3"]
+
+    def test_discovery_rate_limit_response_matches_slowapi(self, client, sample_api_key, monkeypatch):
+        """An exhausted discovery bucket answers 429 with slowapi's error body."""
+        import scim_server.local_bucket as local_bucket
+        from scim_server.config import settings
+
+        empty_bucket = local_bucket.TokenBucket(capacity=1.0, rate=0.0)
+        empty_bucket.tokens = 0.0
+        monkeypatch.setattr(local_bucket, "_discovery_buckets", local_bucket.OrderedDict(testclient=empty_bucket))
+
+        response = client.get(
+            "/scim-identifier/test-server/scim/v2/ResourceTypes",
+            headers={"Authorization": f"Bearer {sample_api_key}"}
+        )
+        assert response.status_code == 429
+        assert response.json() == {
+            "error": f"Rate limit exceeded: {settings.rate_limit_read} per {settings.rate_limit_window} minute"
+        }
@@ -378,4 +378,317 @@ class TestSchemaValidation(DynamicTestDataMixin):
             json=entitlement_data,
             headers={"Authorization": f"Bearer {settings.test_api_key}"}
         )
-        assert response.status_code == 201 
\ No newline at end of file
+        assert response.status_code == 201 
+
+class TestCompiledValidationPlans(DynamicTestDataMixin):
+    """Direct tests for the validator's precompiled per-resource-type plans."""
+
+    def _validator(self, db_session: Session, server_id: str = "validator-plan-test"):
+        from scim_server.schema_validator import create_schema_validator
+        return create_schema_validator(db_session, server_id)
+
+    def test_plan_reused_across_validators(self, db_session: Session):
+        """Plans are compiled once per server config and shared between validators."""
+        plan = self._validator(db_session)._get_plan("User")
+        assert self._validator(db_session)._get_plan("User") is plan
+        assert "userName" in plan.attr_by_name
+        assert all(not entry.is_readonly for entry in plan.create_required)
+
+    def test_create_request_validated_against_plan(self, db_session: Session):
+        """Valid CREATE data passes and missing required fields are reported."""
+        from fastapi import HTTPException
+
+        validator = self._validator(db_session)
+        user_data = self._generate_valid_user_data(db_session, "validator-plan-test")
+        user_data["schemas"] = ["urn:ietf:params:scim:schemas:core:2.0:User"]
+        validated = validator.validate_create_request("User", user_data)
+        assert validated["userName"] == user_data["userName"]
+
+        del user_data["userName"]
+        with pytest.raises(HTTPException) as exc_info:
+            validator.validate_create_request("User", user_data)
+        assert exc_info.value.detail["type"] == "required_field_missing"
+        assert exc_info.value.detail["field"] == "userName"
+
+    def test_non_string_canonical_values_compile(self):
+        """Integer and boolean canonical values compile and are checked by membership."""
+        from fastapi import HTTPException
+        from scim_server.schema_validator import _compile_entry
+
+        entry = _compile_entry(
+            {"name": "level", "type": "integer", "canonicalValues": [1, 2, True]},
+            "User", "validator-plan-test"
+        )
+        assert entry.canonical_set == {1, 2, True}
+
+        with pytest.raises(HTTPException) as exc_info:
+            entry.validate(None, 5, "User")
+        assert exc_info.value.detail["type"] == "invalid_canonical_value"
+
+    def test_unhashable_values_against_canonical_values(self):
+        """Dict and list values of non-scalar attributes get the canonical-value 400."""
+        from fastapi import HTTPException
+        from scim_server.schema_validator import _compile_entry, _compile_create_validator
+
+        entry = _compile_entry(
+            {"name": "ref", "type": "reference", "canonicalValues": ["a", "b"]},
+            "User", "validator-plan-test"
+        )
+        assert entry.canonical_set is None
+        assert entry.validate(None, "a", "User") == "a"
+
+        create = _compile_create_validator([entry], [], "User", "validator-plan-test")
+        for value in ({"x": 1}, ["a"]):
+            with pytest.raises(HTTPException) as exc_info:
+                entry.validate(None, value, "User")
+            assert exc_info.value.status_code == 400
+            assert exc_info.value.detail["type"] == "invalid_canonical_value"
+
+            with pytest.raises(HTTPException) as exc_info:
+                create(None, {"ref": value}, False, True)
+            assert exc_info.value.detail["type"] == "invalid_canonical_value"
+
+    def test_type_validators_dispatched_per_entry(self, db_session: Session):
+        """Each compiled entry carries the type validator for its SCIM type."""
+        from fastapi import HTTPException
+        from scim_server.schema_validator import _TYPE_VALIDATORS
+
+        validator = self._validator(db_session)
+        plan = validator._get_plan("User")
+        assert plan.attr_by_name["userName"].type_validator is _TYPE_VALIDATORS["string"]
+        assert plan.attr_by_name["active"].type_validator is _TYPE_VALIDATORS["boolean"]
+
+        with pytest.raises(HTTPException) as exc_info:
+            validator._validate_attribute(plan.attr_by_name["active"], "yes", "User")
+        assert exc_info.value.detail["type"] == "type_mismatch"
+        assert exc_info.value.detail["expected_type"] == "boolean"
+
+    def test_patch_diff_leaves_existing_data_untouched(self, db_session: Session):
+        """PATCH diffs contain only changed fields and never modify the existing resource."""
+        validator = self._validator(db_session)
+        existing = {
+            "userName": "diffuser",
+            "displayName": "Diff User",
+            "emails": [{"value": "diff@example.com"}],
+        }
+        operations = [
+            {"op": "add", "path": "emails", "value": {"value": "other@example.com"}},
+            {"op": "remove", "path": "displayName"},
+        ]
+
+        to_set, to_delete = validator.validate_patch_request_diff("User", operations, existing)
+
+        assert list(to_set) == ["emails"]
+        assert len(to_set["emails"]) == 2
+        assert to_delete == ["displayName"]
+        assert existing["emails"] == [{"value": "diff@example.com"}]
+        assert validator.validate_patch_request("User", operations, existing) == {
+            "userName": "diffuser",
+            "emails": to_set["emails"],
+        }
+
+    def test_error_details_rendered_from_templates(self, db_session: Session):
+        """Errors are built from per-entry templates without modifying the templates."""
+        from fastapi import HTTPException
+
+        validator = self._validator(db_session)
+        entry = validator._get_plan("User").attr_by_name["userName"]
+
+        with pytest.raises(HTTPException) as exc_info:
+            validator._validate_attribute(entry, 42, "User")
+        detail = exc_info.value.detail
+        assert detail["provided_value"] == 42
+        assert detail["server_id"] == "validator-plan-test"
+        assert detail["resource_type"] == "User"
+        assert "provided_value" not in entry.type_mismatch_detail
+
+    def test_filter_response_data_uses_returned_policy(self, db_session: Session):
+        """Response filtering honours requested/excluded attributes via the compiled plan."""
+        validator = self._validator(db_session)
+        data = {"id": "abc", "userName": "filter-user", "displayName": "Filter User", "unknown": 1}
+
+        assert validator.filter_response_data("User", data) == {
+            "id": "abc", "userName": "filter-user", "displayName": "Filter User"
+        }
+        assert validator.filter_response_data("User", data, requested_attributes=["userName"]) == {
+            "userName": "filter-user"
+        }
+        assert "displayName" not in validator.filter_response_data(
+            "User", data, excluded_attributes=["displayName"]
+        )
+        # Any iterable works; membership is tested against frozensets built once per call
+        assert validator.filter_response_data(
+            "User", data, requested_attributes=("userName", "displayName"), excluded_attributes=iter(["displayName"])
+        ) == {"userName": "filter-user"}
+        # Empty attribute lists take the same unfiltered path as omitted ones
+        assert validator.filter_response_data("User", data, [], []) == validator.filter_response_data("User", data)
+
+    def test_patch_operation_names(self, db_session: Session):
+        """PATCH op names are case-insensitive and unsupported ops are rejected."""
+        from fastapi import HTTPException
+
+        validator = self._validator(db_session)
+        existing = {"userName": "opuser"}
+
+        to_set, _ = validator.validate_patch_request_diff(
+            "User", [{"op": "Replace", "path": "displayName", "value": "Op User"}], existing
+        )
+        assert to_set == {"displayName": "Op User"}
+
+        with pytest.raises(HTTPException) as exc_info:
+            validator.validate_patch_request_diff("User", [{"op": "move", "path": "displayName"}], existing)
+        assert exc_info.value.detail["type"] == "invalid_operation"
+
+    def test_patch_path_leading_slashes_stripped(self, db_session: Session):
+        """All leading slashes are stripped from PATCH paths."""
+        validator = self._validator(db_session)
+        existing = {"userName": "slashuser"}
+
+        for path in ("displayName", "/displayName", "//displayName"):
+            to_set, _ = validator.validate_patch_request_diff(
+                "User", [{"op": "replace", "path": path, "value": "Slash User"}], existing
+            )
+            assert to_set == {"displayName": "Slash User"}
+
+    def test_patch_slash_only_path_rejected(self, db_session: Session):
+        """A path of only slashes is an unknown field, not a full-resource replacement."""
+        from fastapi import HTTPException
+
+        validator = self._validator(db_session)
+        existing = {"userName": "slashuser"}
+
+        for op in ("replace", "add", "remove"):
+            with pytest.raises(HTTPException) as exc_info:
+                validator.validate_patch_request_diff("User", [{"op": op, "path": "/", "value": "x"}], existing)
+            assert exc_info.value.status_code == 400
+            assert exc_info.value.detail["type"] == "unknown_field"
+
+    def test_generated_create_validator(self, db_session: Session):
+        """The generated CREATE validator checks types, canonical values and unknown fields."""
+        from fastapi import HTTPException
+
+        validator = self._validator(db_session)
+        data = self._generate_valid_entitlement_data(db_session, "validator-plan-test")
+        data["schemas"] = ["urn:okta:scim:schemas:core:1.0:Entitlement"]
+        assert validator.validate_create_request("Entitlement", data) == data
+
+        for invalid, error_type in (
+            ({**data, "type": "not-a-canonical-value"}, "invalid_canonical_value"),
+            ({**data, "displayName": 7}, "type_mismatch"),
+            ({**data, "bogus": True}, "unknown_field"),
+        ):
+            with pytest.raises(HTTPException) as exc_info:
+                validator.validate_create_request("Entitlement", invalid)
+            assert exc_info.value.detail["type"] == error_type
+
+    def test_plan_attribute_names_interned(self, db_session: Session):
+        """Compiled attribute names and canonical values are interned so lookups can match by identity."""
+        import sys
+
+        validator = self._validator(db_session)
+        plan = validator._get_plan("User")
+        for name, entry in plan.attr_by_name.items():
+            assert entry.name is sys.intern(name)
+        assert all(name is sys.intern(name) for name in plan.returned_default)
+        canonical_values = [
+            value
+            for entry in validator._get_plan("Entitlement").attr_by_name.values()
+            for value in entry.canonical_values
+        ]
+        assert canonical_values
+        assert all(value is sys.intern(value) for value in canonical_values)
+
+    def test_patch_remove_multi_valued_values(self, db_session: Session):
+        """PATCH remove drops a single value or a list of values; missing values are ignored."""
+        validator = self._validator(db_session)
+        emails = [{"value": f"user{i}@example.com"} for i in range(4)]
+        existing = {"userName": "removeuser", "emails": emails}
+
+        to_set, _ = validator.validate_patch_request_diff(
+            "User", [{"op": "remove", "path": "emails", "value": emails[1]}], existing
+        )
+        assert to_set["emails"] == [emails[0], emails[2], emails[3]]
+
+        to_set, _ = validator.validate_patch_request_diff(
+            "User", [{"op": "remove", "path": "emails", "value": [emails[0], emails[3], {"value": "missing@example.com"}]}], existing
+        )
+        assert to_set["emails"] == [emails[1], emails[2]]
+        assert existing["emails"] == emails
+
+    def test_schemas_resolved_lazily(self, db_session: Session):
+        """Creating a validator resolves no schema; a cached plan needs no schema at all."""
+        from unittest.mock import patch
+        from scim_server.schema_definitions import DynamicSchemaGenerator
+
+        self._validator(db_session)._get_plan("User")
+        with patch.object(DynamicSchemaGenerator, "get_user_schema") as get_user_schema:
+            validator = self._validator(db_session)
+            validator._get_plan("User")
+        get_user_schema.assert_not_called()
+
+    def test_config_change_invalidates_plans(self, db_session: Session):
+        """Saving a server configuration drops its cached plans and schema artifacts."""
+        from scim_server.schema_definitions import _SCHEMA_CACHE
+        from scim_server.schema_validator import _PLAN_CACHE
+        from scim_server.server_config import get_server_config_manager
+
+        server_id = "validator-invalidation-test"
+        self._validator(db_session, server_id)._get_plan("User")
+        assert (server_id, "User") in _PLAN_CACHE
+        assert any(key[0] == server_id for key in _SCHEMA_CACHE)
+
+        get_server_config_manager(db_session).update_server_config(server_id, {"validation_rules": {"strict_mode": True}})
+
+        assert (server_id, "User") not in _PLAN_CACHE
+        assert not any(key[0] == server_id for key in _SCHEMA_CACHE)
+        assert "userName" in self._validator(db_session, server_id)._get_plan("User").attr_by_name
+
+    def test_compiled_value_validators(self, db_session: Session):
+        """Every entry, including sub-attributes, carries a specialized value validator."""
+        from fastapi import HTTPException
+
+        validator = self._validator(db_session)
+        plan = validator._get_plan("User")
+        emails = plan.attr_by_name["emails"]
+
+        assert all(entry.validate is not None for entry in plan.attr_by_name.values())
+        assert all(sub_entry.validate is not None for sub_entry in emails.sub_plan)
+        assert emails.validate(validator, {"value": "a@example.com"}, "User") == [{"value": "a@example.com"}]
+        with pytest.raises(HTTPException) as exc_info:
+            emails.validate(validator, [{"value": 5}], "User")
+        assert exc_info.value.detail["type"] == "type_mismatch"
+
+    def test_request_level_error_templates(self, db_session: Session):
+        """Errors not tied to a schema attribute are rendered from shared templates."""
+        from fastapi import HTTPException
+
+        validator = self._validator(db_session)
+        with pytest.raises(HTTPException) as exc_info:
+            validator.get_schema("Device")
+        assert exc_info.value.detail["message"] == "Unknown resource type 'Device'"
+        assert "type" not in exc_info.value.detail
+
+        with pytest.raises(HTTPException) as exc_info:
+            validator.validate_patch_request("User", [{"op": "replace", "path": "bogus", "value": 1}], {})
+        detail = exc_info.value.detail
+        assert (detail["field"], detail["operation"], detail["type"]) == ("bogus", "PATCH", "unknown_field")
+        assert detail["help"].endswith("Check the schema definition for valid fields.")
+
+    def test_generated_update_validator(self, db_session: Session):
+        """The generated UPDATE validator returns only given fields and rejects readOnly ones."""
+        from fastapi import HTTPException
+
+        validator = self._validator(db_session)
+        assert validator.validate_update_request_diff("User", {"displayName": "Renamed", "active": False}) == {
+            "displayName": "Renamed",
+            "active": False,
+        }
+
+        for invalid, error_type in (
+            ({"id": "client-chosen"}, "readonly_field_modification"),
+            ({"active": "no"}, "type_mismatch"),
+            ({"bogus": 1}, "unknown_field"),
+        ):
+            with pytest.raises(HTTPException) as exc_info:
+                validator.validate_update_request_diff("User", invalid)
+            assert exc_info.value.detail["type"] == error_type
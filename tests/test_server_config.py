@@ -0,0 +1,194 @@
+"""
+Server Configuration Tests
+
+Tests for the per-server configuration manager including:
+- The process-wide, LRU-bounded config cache
+- Eviction of caches derived from server configs
+- Merging configuration updates
+- Loading configs from the database
+"""
+
+import pytest
+from collections import OrderedDict
+from types import MappingProxyType
+from sqlalchemy import event
+
+import scim_server.server_config as server_config
+from scim_server import schema_definitions, schema_validator
+from scim_server.models import Schema
+from scim_server.schema_definitions import DynamicSchemaGenerator
+from scim_server.schema_validator import create_schema_validator
+from scim_server.server_config import ServerConfiguration, _deep_merge
+
+
+@pytest.fixture
+def config_cache(monkeypatch):
+    """Run the test against an empty process-wide config cache, restored afterwards."""
+    cache = OrderedDict()
+    monkeypatch.setattr(server_config, "_CONFIG_CACHE", cache)
+    return cache
+
+
+def _stored_config_rows(db_session, server_id):
+    """Return the stored config rows of a server."""
+    return db_session.query(Schema.schema_definition).filter(
+        Schema.urn == f"urn:scim:server:{server_id}:config"
+    ).all()
+
+
+class TestConfigCache:
+    """Tests for the shared server config cache."""
+
+    def test_config_cache_is_shared_and_lru_bounded(self, db_session, config_cache, monkeypatch):
+        """Managers share one process-wide config cache that evicts least recently used servers."""
+        monkeypatch.setattr(server_config, "_CONFIG_CACHE_MAX_ENTRIES", 2)
+
+        first = ServerConfiguration(db_session).get_server_config("lru-a")
+        assert ServerConfiguration(db_session).get_server_config("lru-a") is first
+
+        ServerConfiguration(db_session).get_server_config("lru-b")
+        ServerConfiguration(db_session).get_server_config("lru-a")
+        ServerConfiguration(db_session).get_server_config("lru-c")
+
+        assert list(config_cache) == ["lru-a", "lru-c"]
+
+    def test_config_eviction_drops_derived_caches(self, db_session, config_cache, monkeypatch):
+        """Per-server schema, plan and generator caches are bounded by config cache evictions."""
+        monkeypatch.setattr(server_config, "_CONFIG_CACHE_MAX_ENTRIES", 1)
+
+        DynamicSchemaGenerator.for_server(db_session, "evict-a").get_schemas_response_bytes()
+        create_schema_validator(db_session, "evict-a")._get_plan("User")
+        assert "evict-a" in schema_definitions._GENERATORS
+
+        DynamicSchemaGenerator.for_server(db_session, "evict-b").get_user_schema()
+
+        assert list(config_cache) == ["evict-b"]
+        assert "evict-a" not in schema_definitions._GENERATORS
+        for cache in (
+            schema_definitions._SCHEMA_CACHE,
+            schema_definitions._SCHEMA_LIST_CACHE,
+            schema_definitions._JSON_CACHE,
+            schema_validator._PLAN_CACHE,
+        ):
+            assert not any(key[0] == "evict-a" for key in cache)
+
+
+    def test_config_cache_hits_do_not_wait_for_lock(self, db_session, config_cache):
+        """Cache hits are served while another thread holds the cache lock."""
+        server_id = "lock-free-hit-test"
+        config_manager = ServerConfiguration(db_session)
+        config = config_manager.get_server_config(server_id)
+
+        with server_config._CONFIG_CACHE_LOCK:
+            assert config_manager.get_server_config(server_id) is config
+
+
+    def test_expired_unchanged_config_is_not_reparsed(self, db_session, config_cache, monkeypatch):
+        """A TTL reload of an unchanged config compares stored text instead of parsing it."""
+        server_id = "no-reparse-test"
+        config_manager = ServerConfiguration(db_session)
+        config = config_manager.get_server_config(server_id)
+        config_cache[server_id] = (config, 0.0)
+
+        def fail_parse(_):
+            raise AssertionError("unchanged config was parsed again")
+
+        monkeypatch.setattr(server_config.orjson, "loads", fail_parse)
+        assert config_manager.get_server_config(server_id) is config
+
+
+@pytest.fixture
+def select_statements(db_session):
+    """Collect the SELECT statements run on the test engine while the test runs."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "after_cursor_execute", record)
+    yield statements
+    event.remove(engine, "after_cursor_execute", record)
+
+
+class TestConfigStorage:
+    """Tests for loading and saving server configs."""
+
+    def test_preload_server_configs_batches_lookup(self, db_session, config_cache, select_statements):
+        """Stored configs of several servers are cached by one preload query."""
+        for server_id in ("preload-a", "preload-b"):
+            ServerConfiguration(db_session).get_server_config(server_id)
+        config_cache.clear()
+        select_statements.clear()
+
+        config_manager = ServerConfiguration(db_session)
+        config_manager.preload_server_configs(["preload-a", "preload-b", "preload-missing"])
+
+        assert len(select_statements) == 1
+        assert list(config_cache) == ["preload-a", "preload-b"]
+        assert server_config.get_cached_server_config("preload-a") is not None
+        assert "_enabled_index" in config_manager.get_server_config("preload-b")
+        assert len(select_statements) == 1
+
+
+    def test_save_server_config_upserts_single_row(self, db_session):
+        """Saving a config twice updates the one stored row instead of inserting another."""
+        server_id = "upsert-test"
+        config_manager = ServerConfiguration(db_session)
+        config = config_manager.get_server_config(server_id)
+        config_manager._save_server_config(server_id, {**config, "name": "Renamed"})
+
+        rows = _stored_config_rows(db_session, server_id)
+        assert len(rows) == 1
+        assert '"name":"Renamed"' in rows[0][0]
+
+    def test_save_server_config_without_upsert_support(self, db_session, monkeypatch):
+        """Dialects without ON CONFLICT insert a new config row and update an existing one."""
+        monkeypatch.setattr(server_config, "_UPSERT_INSERTS", {})
+        server_id = "core-save-test"
+        config_manager = ServerConfiguration(db_session)
+        config = config_manager._create_default_config(server_id)
+
+        config_manager._save_server_config(server_id, config)
+        rows = _stored_config_rows(db_session, server_id)
+        assert len(rows) == 1
+
+        saved = config_manager._save_server_config(server_id, {**config, "name": "Renamed"})
+        rows = _stored_config_rows(db_session, server_id)
+        assert len(rows) == 1
+        assert '"name":"Renamed"' in rows[0][0]
+        assert config_manager.get_server_config(server_id) is saved
+
+
+class TestConfigUpdates:
+    """Tests for applying updates to server configs."""
+
+    def test_deep_merge_recurses_into_dicts_only(self):
+        """Config updates merge nested dicts and replace every other value."""
+        base = {"rules": {"strict_mode": True, "nested": {"a": 1}}, "types": ["User"]}
+        merged = _deep_merge(base, {"rules": {"nested": {"b": 2}}, "types": ["Group"], "new": {}})
+
+        assert merged == {
+            "rules": {"strict_mode": True, "nested": {"a": 1, "b": 2}},
+            "types": ["Group"],
+            "new": {},
+        }
+        assert base["rules"]["nested"] == {"a": 1}
+
+    def test_config_changes_replace_cached_object(self, db_session, config_cache):
+        """Config setters save a new cached object instead of modifying the shared one."""
+        server_id = "copy-on-write-test"
+        config_manager = ServerConfiguration(db_session)
+        config = config_manager.get_server_config(server_id)
+
+        config_manager.set_server_app_profile(server_id, "hr")
+        config_manager.enable_password_support(server_id)
+
+        assert config["app_profile"] is None
+        assert "password_support" not in config or not config["password_support"].get("enabled")
+        updated = config_manager.get_server_config(server_id)
+        assert updated is not config
+        assert updated["app_profile"] == "hr"
+        assert config_manager.is_password_support_enabled(server_id)
+        assert isinstance(config_manager.get_password_validation_rules(server_id), MappingProxyType)